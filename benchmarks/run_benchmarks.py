@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark suite for vibing-fun
+Times the hot paths of the snake game and both waiting screens under SDL's
+dummy video driver, writes JSON results and compares them with a baseline
+"""
+
+import os
+
+# Must be set before pygame is imported anywhere
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import contextlib
+import importlib.util
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAKE_DIR = os.path.join(ROOT, "snake-game")
+WAITING_DIR = os.path.join(ROOT, "waiting-screen")
+
+SNAKE_LENGTHS = [10, 50, 200, 800, 1700]
+WORLD_SIZE = 2000
+WORLD_SNAKE_LENGTH = 200000
+SIGNAGE_SIZE = (3840, 2160)
+SIGNAGE_RESOLUTION = (320, 180)
+REPEATS = 5
+MIN_SAMPLE_TIME = 0.05  # seconds per repeat
+DEFAULT_THRESHOLD = 0.10
+
+# (name, fn) or (name, (setup, fn)); setup runs once before timing fn
+Benchmark = Tuple[str, Union[Callable[[], None], Tuple[Callable[[], None], Callable[[], None]]]]
+
+def load_module(name: str, path: str):
+    """Import a script by path; both apps call their entry point main.py"""
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# Snake game
+
+def cycle_direction(core, x: int, y: int, width: int, height: int):
+    """Hamiltonian cycle over an even-width board: zigzag columns, return along row 0"""
+    Direction = core.Direction
+    if y == 0:
+        return Direction.LEFT if x > 0 else Direction.DOWN
+    if x % 2 == 0:
+        return Direction.DOWN if y < height - 1 else Direction.RIGHT
+    if y > 1 or x == width - 1:
+        return Direction.UP
+    return Direction.RIGHT
+
+def grow_snake(core, snake, length: int):
+    """Grow snake along the Hamiltonian cycle so it can keep moving safely"""
+    while snake.length < length:
+        snake.direction = cycle_direction(core, snake.head_x, snake.head_y, snake.width, snake.height)
+        snake.grow = True
+        snake.move()
+
+def snake_benchmarks() -> Iterator[Benchmark]:
+    game_module = load_module("snake_main", os.path.join(SNAKE_DIR, "main.py"))
+    core = sys.modules["core"]
+    game = game_module.Game(seed=0)
+    width, height = game_module.GRID_WIDTH, game_module.GRID_HEIGHT
+
+    # Direction lookup so the move loop measures the snake, not the cycle math
+    directions = [cycle_direction(core, cell % width, cell // width, width, height)
+                  for cell in range(width * height)]
+
+    for length in SNAKE_LENGTHS:
+        snake = core.Snake(width, height)
+        grow_snake(core, snake, length)
+
+        def move(snake=snake):
+            snake.direction = directions[snake.head_y * width + snake.head_x]
+            snake.move()
+
+        yield f"snake.move[{length}]", move
+        yield f"snake.check_collision[{length}]", snake.check_collision
+
+    for length in SNAKE_LENGTHS:
+        def draw_snake(length=length):
+            game.draw_snake(0.5)
+
+        def setup(length=length):
+            game.sim.reset(0)
+            grow_snake(core, game.snake, length)
+            game.previous_length = game.snake.length - 1
+
+        yield f"snake.draw[{length}]", (setup, draw_snake)
+
+    for length in (10, 800, 1700):
+        def frame():
+            game.animate(1 / 60)
+            game.draw(0.5)
+
+        def setup(length=length):
+            game.sim.reset(0)
+            grow_snake(core, game.snake, length)
+            game.previous_length = game.snake.length - 1
+
+        yield f"snake.frame[{length}]", (setup, frame)
+
+    # Scrolling board: frame cost should follow what is on screen, not snake length
+    world = game_module.Game(seed=0, board_size=(WORLD_SIZE, WORLD_SIZE))
+    for length in (10, WORLD_SNAKE_LENGTH):
+        def world_frame():
+            world.animate(1 / 60)
+            world.draw(0.5)
+
+        def setup(length=length):
+            world.sim.reset(0)
+            grow_snake(core, world.snake, length)
+            world.previous_length = world.snake.length - 1
+
+        yield f"snake.world_frame[{length}]", (setup, world_frame)
+
+    # Autopilot decision plus the tick it drives; a finished game starts over
+    bots = sys.modules["bots"]
+    for board in ((width, height), (WORLD_SIZE, WORLD_SIZE)):
+        def autopilot_tick(sim=core.Simulation(*board, seed=0), policy=bots.AutopilotPolicy(0)):
+            if sim.step(policy(sim))[2]:
+                sim.reset(sim.ticks)
+
+        yield f"autopilot.tick[{board[0]}x{board[1]}]", autopilot_tick
+
+    particles = game_module.ParticleSystem()
+    color = game_module.SNAKE_HEAD_COLOR
+
+    def burst():
+        # One death burst over its whole lifetime
+        particles.clear()
+        particles.emit(500, 350, color, 30)
+        while particles.count:
+            particles.update()
+            particles.draw(game.screen)
+
+    def steady():
+        particles.emit(500, 350, color, 4000 - particles.count)
+        particles.update(0.1)
+        particles.draw(game.screen)
+
+    yield "particles.burst[30]", burst
+    yield "particles.steady[4000]", steady
+
+    full = core.Simulation(width, height, seed=0)
+    grow_snake(core, full.snake, width * height - 10)
+
+    def respawn():
+        full.food.generate_position(full.snake)
+
+    yield "food.respawn[10 free]", respawn
+
+# Waiting screens
+
+def waiting_screen_benchmarks() -> Iterator[Benchmark]:
+    module = load_module("waiting_main", os.path.join(WAITING_DIR, "main.py"))
+    screen = module.WaitingScreen()
+    screen.update_animations(1.0)
+
+    # Every zero-argument draw_* method, so new layers are picked up automatically
+    for name, method in inspect.getmembers(screen, inspect.ismethod):
+        if name.startswith("draw_") and not inspect.signature(method).parameters:
+            yield f"waiting.{name}", method
+
+    def frame():
+        screen.update_animations(1 / 60)
+        screen.draw()
+
+    yield "waiting.frame", frame
+
+    def composited_frame():
+        screen.update_animations(1 / 60)
+        screen.compositor.render(screen.time)
+
+    yield "waiting.composited_frame", composited_frame
+
+    # 4K signage: rendering at native resolution against a low resolution render upscaled to it
+    for label, resolution in (("native", None), ("{}x{}".format(*SIGNAGE_RESOLUTION), SIGNAGE_RESOLUTION)):
+        signage = module.WaitingScreen(resolution=resolution, window_size=SIGNAGE_SIZE)
+
+        def signage_frame(signage=signage):
+            signage.update_animations(1 / 60)
+            signage.present(signage.compositor.render(signage.time))
+
+        yield f"waiting.signage_frame[{label}]", signage_frame
+
+def ascii_benchmarks() -> Iterator[Benchmark]:
+    module = load_module("ascii_main", os.path.join(WAITING_DIR, "ascii_main.py"))
+    screen = module.ASCIIWaitingScreen()
+    sink = open(os.devnull, "w")
+
+    # Write the clear sequence instead of spawning `clear`, so the frame itself is measured
+    screen.clear_screen = lambda: sink.write("\033[2J\033[H")
+
+    def draw_frame():
+        with contextlib.redirect_stdout(sink):
+            screen.draw_frame()
+        screen.frame += 1
+
+    yield "ascii.draw_frame", draw_frame
+
+def startup_benchmarks() -> Iterator[Benchmark]:
+    # Whole cold start in a fresh interpreter: imports, window and first frame
+    for name, directory in (("snake", SNAKE_DIR), ("waiting", WAITING_DIR)):
+        def startup(directory=directory):
+            subprocess.run([sys.executable, "main.py", "--startup-time"], cwd=directory,
+                           check=True, stdout=subprocess.DEVNULL)
+
+        yield f"{name}.startup", startup
+
+SUITES = [snake_benchmarks, waiting_screen_benchmarks, ascii_benchmarks, startup_benchmarks]
+
+# Timing
+
+def measure(fn: Callable[[], None]) -> Dict[str, float]:
+    # Calibrate the batch size so each repeat runs for at least MIN_SAMPLE_TIME
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_TIME:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(MIN_SAMPLE_TIME / elapsed * 1.2))
+
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {"median_us": statistics.median(samples), "min_us": min(samples), "number": number}
+
+def run(pattern: Optional[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for suite in SUITES:
+        for name, bench in suite():
+            if pattern and pattern not in name:
+                continue
+            if isinstance(bench, tuple):
+                setup, bench = bench
+                setup()
+            results[name] = measure(bench)
+            print(f"{name:<40}{results[name]['median_us']:>12.1f} us")
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str, threshold: float) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\nCompared with {baseline_path} (threshold {threshold:.0%}):")
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<40}{'new':>12}")
+            continue
+        ratio = result["median_us"] / baseline[name]["median_us"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:<40}{ratio:>11.2f}x{flag}")
+    return regressions
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("-k", "--filter", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a stored results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter)
+    with open(args.output, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "platform": platform.platform(),
+                "video_driver": os.environ["SDL_VIDEODRIVER"],
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
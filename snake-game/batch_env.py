@@ -0,0 +1,175 @@
+"""
+Vectorized batch Snake engine
+Runs N independent games in NumPy arrays and advances all of them with a
+single step call, using the same rules as core.Simulation
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core import BOARD_HEIGHT, BOARD_WIDTH, FOOD_REWARD, Direction
+
+# Action i turns the snake towards ACTIONS[i]; -1 keeps the current direction
+ACTIONS = list(Direction)
+NO_ACTION = -1
+
+_DX = np.array([d.value[0] for d in ACTIONS], dtype=np.int32)
+_DY = np.array([d.value[1] for d in ACTIONS], dtype=np.int32)
+_OPPOSITE = np.array([ACTIONS.index(Direction.DOWN), ACTIONS.index(Direction.UP),
+                      ACTIONS.index(Direction.RIGHT), ACTIONS.index(Direction.LEFT)],
+                     dtype=np.int8)
+_RIGHT = ACTIONS.index(Direction.RIGHT)
+
+# splitmix64 constants
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+def _mix64(z: np.ndarray) -> np.ndarray:
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+class BatchState(NamedTuple):
+    head_x: np.ndarray
+    head_y: np.ndarray
+    direction: np.ndarray
+    length: np.ndarray
+    food: np.ndarray
+    score: np.ndarray
+    ticks: np.ndarray
+
+class BatchSimulation:
+    def __init__(self, num_games: int, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT,
+                 seed: int = 0):
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.capacity = width * height
+        self.games = np.arange(num_games)
+
+        # Per-game ring buffer of body cells plus an occupancy board
+        self.body = np.zeros((num_games, self.capacity), dtype=np.int32)
+        self.occupied = np.zeros((num_games, self.capacity), dtype=bool)
+        self.head_slot = np.zeros(num_games, dtype=np.int32)
+        self.length = np.zeros(num_games, dtype=np.int32)
+        self.head_x = np.zeros(num_games, dtype=np.int32)
+        self.head_y = np.zeros(num_games, dtype=np.int32)
+        self.direction = np.zeros(num_games, dtype=np.int8)
+        self.grow = np.zeros(num_games, dtype=bool)
+        self.food = np.zeros(num_games, dtype=np.int32)
+        self.score = np.zeros(num_games, dtype=np.int32)
+        self.ticks = np.zeros(num_games, dtype=np.int32)
+        self.episodes = np.zeros(num_games, dtype=np.int64)
+        self.last_score = np.zeros(num_games, dtype=np.int32)
+
+        # Each game owns a splitmix64 stream, so results do not depend on batch size
+        self.rng_state = np.zeros(num_games, dtype=np.uint64)
+        self.seed(seed)
+        self.reset()
+
+    def seed(self, seed: int):
+        with np.errstate(over="ignore"):
+            base = np.uint64(seed & 0xFFFFFFFFFFFFFFFF)
+            self.rng_state[:] = _mix64(base + self.games.astype(np.uint64) * _GOLDEN)
+
+    def _random(self, games: np.ndarray) -> np.ndarray:
+        with np.errstate(over="ignore"):
+            state = self.rng_state[games] + _GOLDEN
+            self.rng_state[games] = state
+            return _mix64(state)
+
+    def state(self) -> BatchState:
+        return BatchState(self.head_x, self.head_y, self.direction, self.length,
+                          self.food, self.score, self.ticks)
+
+    def reset(self, games: Optional[np.ndarray] = None) -> BatchState:
+        if games is None:
+            games = self.games
+        if len(games):
+            center = (self.height // 2) * self.width + self.width // 2
+            self.occupied[games] = False
+            self.occupied[games, center] = True
+            self.body[games, 0] = center
+            self.head_slot[games] = 0
+            self.length[games] = 1
+            self.head_x[games] = self.width // 2
+            self.head_y[games] = self.height // 2
+            self.direction[games] = _RIGHT
+            self.grow[games] = False
+            self.score[games] = 0
+            self.ticks[games] = 0
+            self._place_food(games)
+        return self.state()
+
+    def _place_food(self, games: np.ndarray) -> np.ndarray:
+        # Pick the r-th free cell of each board; returns the games with no free cell left
+        free_count = self.capacity - self.length[games]
+        full = free_count == 0
+        placing = games[~full]
+        if len(placing):
+            r = (self._random(placing) % free_count[~full].astype(np.uint64)).astype(np.int64)
+            free_rank = np.cumsum(~self.occupied[placing], axis=1)
+            self.food[placing] = np.argmax(free_rank > r[:, None], axis=1)
+        self.food[games[full]] = -1
+        return games[full]
+
+    def step(self, actions: Optional[np.ndarray] = None) -> Tuple[BatchState, np.ndarray, np.ndarray]:
+        """Advance every game one tick and reset the ones that finished.
+
+        Returns the state after auto-reset, the score gained by each game and
+        which games ended this tick; scores of ended games are in last_score.
+        """
+        games = self.games
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            turn = (actions >= 0) & (actions != _OPPOSITE[self.direction])
+            self.direction[turn] = actions[turn]
+
+        x = self.head_x + _DX[self.direction]
+        y = self.head_y + _DY[self.direction]
+        self.head_x[:] = x
+        self.head_y[:] = y
+        self.ticks += 1
+
+        wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        moving = ~wall
+
+        # Free the tail first so the head may follow it into the same cell
+        shrink = moving & ~self.grow
+        tail_slot = (self.head_slot - self.length + 1) % self.capacity
+        self.occupied[games[shrink], self.body[games, tail_slot][shrink]] = False
+        self.length += moving & self.grow
+        self.grow &= wall
+
+        cell = np.where(moving, y * self.width + x, 0)
+        hit = moving & self.occupied[games, cell]
+        self.occupied[games[moving], cell[moving]] = True
+        self.head_slot[moving] = (self.head_slot[moving] + 1) % self.capacity
+        self.body[games[moving], self.head_slot[moving]] = cell[moving]
+
+        dead = wall | hit
+        ate = ~dead & (cell == self.food)
+        self.grow |= ate
+        rewards = ate.astype(np.int32) * FOOD_REWARD
+        self.score += rewards
+
+        dones = dead.copy()
+        eaten = games[ate]
+        if len(eaten):
+            dones[self._place_food(eaten)] = True
+
+        self.last_score[:] = np.where(dones, self.score, 0)
+        finished = games[dones]
+        self.episodes[finished] += 1
+        self.reset(finished)
+        return self.state(), rewards, dones
+
+    def grids(self) -> np.ndarray:
+        """Board observation per game: 0 empty, 1 body, 2 head, 3 food"""
+        grids = self.occupied.astype(np.int8)
+        has_food = self.food >= 0
+        grids[self.games[has_food], self.food[has_food]] = 3
+        grids[self.games, self.body[self.games, self.head_slot]] = 2
+        return grids.reshape(self.num_games, self.height, self.width)
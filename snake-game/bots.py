@@ -0,0 +1,323 @@
+"""
+Bot policies for the headless Snake simulation
+A policy is built with policy_class(seed) and called once per tick with the
+Simulation; it returns the Direction to turn to, or None to keep going
+"""
+
+import heapq
+import importlib
+import random
+import time
+from array import array
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core import OPPOSITE_DIRECTIONS, Direction, Simulation, Snake
+
+Policy = Callable[[Simulation], Optional[Direction]]
+
+# Autopilot search limits; both keep the cost of one decision bounded on any board
+PLAN_BUDGET = 250    # A* expansions per replan; past it, head for the closest cell found
+SPACE_BUDGET = 200   # free cells that count as enough room to survive a move
+REPLAN_DELAY = 4     # ticks to wander after a plan fails before searching again
+STALL_SLACK = 100    # ticks past one per board cell without food before safety checks are dropped
+COST_SAMPLES = 1024
+
+def is_safe(sim: Simulation, direction: Direction) -> bool:
+    """True if moving one cell in direction does not crash right away"""
+    snake = sim.snake
+    x = snake.head_x + direction.value[0]
+    y = snake.head_y + direction.value[1]
+    if x < 0 or x >= snake.width or y < 0 or y >= snake.height:
+        return False
+    cell = y * snake.width + x
+    if not snake.occupied[cell]:
+        return True
+    # The tail moves out of the way unless the snake is about to grow
+    tail = snake.cells[snake.head_slot - snake.length + 1]
+    return cell == tail and not snake.grow and snake.length > 1
+
+class RandomPolicy:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def __call__(self, sim: Simulation) -> Optional[Direction]:
+        if self.rng.random() < 0.2:
+            return self.rng.choice(list(Direction))
+        return None
+
+class SafeRandomPolicy:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def __call__(self, sim: Simulation) -> Optional[Direction]:
+        current = sim.snake.direction
+        if self.rng.random() >= 0.2 and is_safe(sim, current):
+            return None
+        options = [d for d in Direction if d != OPPOSITE_DIRECTIONS[current] and is_safe(sim, d)]
+        return self.rng.choice(options) if options else None
+
+class GreedyPolicy:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def __call__(self, sim: Simulation) -> Optional[Direction]:
+        snake = sim.snake
+        food = sim.food.position
+        if food is None:
+            return None
+        best = None
+        best_distance = None
+        options = [d for d in Direction if d != OPPOSITE_DIRECTIONS[snake.direction]]
+        self.rng.shuffle(options)
+        for direction in options:
+            if not is_safe(sim, direction):
+                continue
+            distance = (abs(snake.head_x + direction.value[0] - food[0]) +
+                        abs(snake.head_y + direction.value[1] - food[1]))
+            if best_distance is None or distance < best_distance:
+                best = direction
+                best_distance = distance
+        return best
+
+class AutopilotPolicy:
+    """
+    Follows a time-aware A* path to the food and only takes a step if the
+    snake still has room to escape afterwards, counting body cells as free
+    once the tail will have left them. The path is reused across ticks and
+    replanned only when the food moves or the snake leaves it; search buffers
+    are allocated once per board and stamped with a generation, not cleared.
+    Works on anything with .snake and .food.position, including online rooms.
+    """
+
+    def __init__(self, seed: int, plan_budget: int = PLAN_BUDGET, space_budget: int = SPACE_BUDGET):
+        self.rng = random.Random(seed)
+        self.plan_budget = plan_budget
+        self.space_budget = space_budget
+        self.capacity = 0
+        self.path = deque()  # planned cells, next step first
+        self.target = None   # food cell the path leads to
+        self.expected = None  # where the head should be if the last step was taken
+        self.wait = 0
+        self.last_food = None
+        self.hungry = 0  # ticks since the food last moved
+        self.replans = 0
+        self.costs = deque(maxlen=COST_SAMPLES)
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.generation = 0
+        self.stamp = array('i', bytes(4 * capacity))
+        self.cost = array('i', bytes(4 * capacity))
+        self.parent = array('i', bytes(4 * capacity))
+
+    def __call__(self, sim: Simulation) -> Optional[Direction]:
+        # Buffers are allocated once per board; keep that out of the decision timings
+        if self.capacity != sim.snake.capacity:
+            self._allocate(sim.snake.capacity)
+        start = time.perf_counter()
+        food = sim.food.position
+        direction = self.decide(sim.snake, None if food is None else food[1] * sim.snake.width + food[0])
+        self.costs.append(time.perf_counter() - start)
+        return direction
+
+    def stats(self) -> str:
+        if not self.costs:
+            return "Autopilot: -"
+        ordered = sorted(self.costs)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return (f"Autopilot us  mean: {sum(ordered) / len(ordered) * 1e6:.0f}  p99: {p99 * 1e6:.0f}  "
+                f"max: {ordered[-1] * 1e6:.0f}  replans: {self.replans}")
+
+    def decide(self, snake: Snake, food: Optional[int]) -> Optional[Direction]:
+        width = snake.width
+        if self.capacity != snake.capacity:
+            self._allocate(snake.capacity)
+        head = snake.head_y * width + snake.head_x
+        # The snake cannot reverse, so the cell behind the head is never a first step
+        dx, dy = snake.direction.value
+        behind_x, behind_y = snake.head_x - dx, snake.head_y - dy
+        behind = behind_y * width + behind_x if 0 <= behind_x < width and 0 <= behind_y < snake.height else -1
+
+        # Circling the food forever is worse than dying: once a whole board's worth of
+        # ticks passes without eating, planned steps no longer need room to escape
+        if food != self.last_food:
+            self.last_food = food
+            self.hungry = 0
+        else:
+            self.hungry += 1
+        stalled = self.hungry > snake.capacity + STALL_SLACK
+
+        if self.path and (food != self.target or head != self.expected):
+            self.path.clear()
+        if not self.path and food is not None:
+            if self.wait:
+                self.wait -= 1
+            else:
+                self.plan(snake, head, behind, food)
+        if self.path:
+            step = self.path[0]
+            if self.passable(snake, step, 1) and (stalled or self.room(snake, step)[0]):
+                self.path.popleft()
+                self.expected = step
+                return self.direction(width, head, step)
+            self.path.clear()
+            self.wait = REPLAN_DELAY
+        return self.escape(snake, head, behind, food)
+
+    @staticmethod
+    def direction(width: int, head: int, cell: int) -> Direction:
+        if cell == head - width:
+            return Direction.UP
+        if cell == head + width:
+            return Direction.DOWN
+        return Direction.LEFT if cell == head - 1 else Direction.RIGHT
+
+    @staticmethod
+    def neighbors(cell: int, width: int, capacity: int) -> List[int]:
+        x = cell % width
+        cells = []
+        if cell >= width:
+            cells.append(cell - width)
+        if cell + width < capacity:
+            cells.append(cell + width)
+        if x:
+            cells.append(cell - 1)
+        if x < width - 1:
+            cells.append(cell + 1)
+        return cells
+
+    @staticmethod
+    def passable(snake: Snake, cell: int, t: int) -> bool:
+        """Whether the head can be on cell t moves from now, once the tail has moved off it"""
+        if not snake.occupied[cell]:
+            return True
+        return t >= snake.length - snake.segment_index(cell) + snake.grow
+
+    def room(self, snake: Snake, start: int) -> Tuple[bool, int]:
+        """Bounded BFS from start: (enough room or reaches the moving tail, cells seen)"""
+        self.generation += 1
+        generation, stamp = self.generation, self.stamp
+        width, capacity = snake.width, snake.capacity
+        last_x = width - 1
+        occupied, segment_index = snake.occupied, snake.segment_index
+        vacated = snake.length + snake.grow  # body index i is free from t >= vacated - i
+        need = min(snake.length + 1, self.space_budget)
+        stamp[start] = generation
+        frontier = [start]
+        count = 1
+        t = 1
+        while frontier:
+            t += 1
+            next_frontier = []
+            for cell in frontier:
+                # Inlined neighbours: this loop is most of the per-tick cost
+                x = cell % width
+                for n in (cell - width if cell >= width else -1,
+                          cell + width if cell + width < capacity else -1,
+                          cell - 1 if x else -1,
+                          cell + 1 if x < last_x else -1):
+                    if n < 0 or stamp[n] == generation:
+                        continue
+                    stamp[n] = generation
+                    if occupied[n]:
+                        if t >= vacated - segment_index(n):
+                            return True, count
+                        continue
+                    count += 1
+                    if count >= need:
+                        return True, count
+                    next_frontier.append(n)
+            frontier = next_frontier
+        return False, count
+
+    def plan(self, snake: Snake, head: int, behind: int, food: int):
+        self.replans += 1
+        self.generation += 1
+        generation, stamp, cost, parent = self.generation, self.stamp, self.cost, self.parent
+        width, capacity, neighbors = snake.width, snake.capacity, self.neighbors
+        occupied, segment_index = snake.occupied, snake.segment_index
+        vacated = snake.length + snake.grow
+        food_x, food_y = food % width, food // width
+
+        stamp[head] = generation
+        cost[head] = 0
+        if 0 <= behind < capacity:
+            stamp[behind] = generation
+            cost[behind] = 0
+        best = head
+        best_h = abs(snake.head_x - food_x) + abs(snake.head_y - food_y)
+        heap = [(best_h, 0, head)]
+        expansions = 0
+        while heap and expansions < self.plan_budget:
+            _, g, cell = heapq.heappop(heap)
+            g = -g
+            if cell == food:
+                best = cell
+                break
+            if g > cost[cell]:
+                continue
+            expansions += 1
+            g += 1
+            for n in neighbors(cell, width, capacity):
+                if stamp[n] == generation and cost[n] <= g:
+                    continue
+                if occupied[n] and g < vacated - segment_index(n):
+                    continue
+                stamp[n] = generation
+                cost[n] = g
+                parent[n] = cell
+                h = abs(n % width - food_x) + abs(n // width - food_y)
+                if h < best_h:
+                    best, best_h = n, h
+                # Ties go to the deeper node, which heads straight for the food
+                heapq.heappush(heap, (g + h, -g, n))
+
+        # Out of budget: follow the path to the closest cell found and plan again from there
+        path = []
+        cell = best
+        while cell != head:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        self.path = deque(path)
+        self.target = food
+        if not path:
+            self.wait = REPLAN_DELAY
+
+    def escape(self, snake: Snake, head: int, behind: int, food: Optional[int]) -> Optional[Direction]:
+        """No usable plan: the move nearest the food that leaves room, else the one with most room"""
+        width = snake.width
+        cells = [cell for cell in self.neighbors(head, width, snake.capacity)
+                 if cell != behind and self.passable(snake, cell, 1)]
+        if food is not None:
+            food_x, food_y = food % width, food // width
+            cells.sort(key=lambda cell: abs(cell % width - food_x) + abs(cell // width - food_y))
+        best = None
+        best_room = (False, -1)
+        for cell in cells:
+            room = self.room(snake, cell)
+            if room > best_room:
+                best, best_room = cell, room
+                if room[0]:
+                    break
+        if best is None:
+            return None
+        self.expected = best
+        return self.direction(width, head, best)
+
+POLICIES: Dict[str, Callable[[int], Policy]] = {
+    'random': RandomPolicy,
+    'safe-random': SafeRandomPolicy,
+    'greedy': GreedyPolicy,
+    'autopilot': AutopilotPolicy,
+}
+
+def load_policy(spec: str) -> Callable[[int], Policy]:
+    """Look up a built-in policy by name, or import one given as module:attribute"""
+    if spec in POLICIES:
+        return POLICIES[spec]
+    if ':' not in spec:
+        raise ValueError(f"Unknown policy '{spec}'; choose from {', '.join(POLICIES)} or use module:attribute")
+    module_name, attribute = spec.split(':', 1)
+    return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,350 @@
+"""
+Headless Snake simulation core
+Pure-Python game rules with no pygame dependency, shared by the renderer,
+bots and tools
+"""
+
+import random
+from array import array
+from enum import Enum
+from typing import Iterator, NamedTuple, Optional, Sequence, Tuple
+
+# Default board matches the 1000x700 window at 20px cells
+BOARD_WIDTH = 50
+BOARD_HEIGHT = 35
+
+FOOD_REWARD = 10
+
+class Direction(Enum):
+    UP = (0, -1)
+    DOWN = (0, 1)
+    LEFT = (-1, 0)
+    RIGHT = (1, 0)
+
+OPPOSITE_DIRECTIONS = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT
+}
+
+# Free cells are counted per block, and per group of blocks in a Fenwick tree, so
+# finding the r-th free cell takes O(log groups) plus at most 64 blocks and 64 cells
+BLOCK_BITS = 6    # 64 cells per block
+GROUP_BITS = 12   # 4096 cells per group
+
+class FreeCellIndex:
+    """
+    The free cells of a board. Sampling picks the r-th free cell in board
+    order, so the result depends only on which cells are free and never on
+    the order they were freed in, and snapshots need not store it
+    """
+
+    def __init__(self, capacity: int):
+        self.free = bytearray(b'\x01') * capacity
+        self.block_free = array('i', (min(1 << BLOCK_BITS, capacity - start)
+                                      for start in range(0, capacity, 1 << BLOCK_BITS)))
+        # 1-based Fenwick tree over the free count of each group
+        groups = -(-capacity >> GROUP_BITS)
+        tree = self.group_tree = array('i', bytes(4 * (groups + 1)))
+        for node in range(1, groups + 1):
+            tree[node] += min(1 << GROUP_BITS, capacity - ((node - 1) << GROUP_BITS))
+            parent = node + (node & -node)
+            if parent <= groups:
+                tree[parent] += tree[node]
+        self.top_step = 1 << (groups.bit_length() - 1) if groups else 0
+        self.count = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, cell: int) -> bool:
+        return self.free[cell] == 1
+
+    def _add_to_group(self, cell: int, delta: int):
+        tree = self.group_tree
+        node = (cell >> GROUP_BITS) + 1
+        while node < len(tree):
+            tree[node] += delta
+            node += node & -node
+
+    def remove(self, cell: int):
+        self.free[cell] = 0
+        self.block_free[cell >> BLOCK_BITS] -= 1
+        self._add_to_group(cell, -1)
+        self.count -= 1
+
+    def add(self, cell: int):
+        self.free[cell] = 1
+        self.block_free[cell >> BLOCK_BITS] += 1
+        self._add_to_group(cell, 1)
+        self.count += 1
+
+    def sample(self, rng: random.Random) -> Optional[int]:
+        if self.count == 0:
+            return None
+        rank = rng.randrange(self.count)
+        # Descend the tree to the group holding the rank-th free cell
+        tree, group, step = self.group_tree, 0, self.top_step
+        while step:
+            node = group + step
+            if node < len(tree) and tree[node] <= rank:
+                group = node
+                rank -= tree[node]
+            step >>= 1
+        block = group << (GROUP_BITS - BLOCK_BITS)
+        block_free = self.block_free
+        while rank >= block_free[block]:
+            rank -= block_free[block]
+            block += 1
+        cell = block << BLOCK_BITS
+        free = self.free
+        while True:
+            if free[cell]:
+                if not rank:
+                    return cell
+                rank -= 1
+            cell += 1
+
+class Snake:
+    def __init__(self, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT):
+        self.width = width
+        self.height = height
+        self.capacity = width * height
+
+        # Body is a ring buffer of cell indices (y * width + x); the head lives at
+        # cells[head_slot] and the tail `length - 1` slots behind it.
+        self.cells = array('i', bytes(4 * self.capacity))
+        self.occupied = bytearray(self.capacity)
+
+        # Spatial index back into the ring: cell -> slot it was last written to,
+        # valid while the cell is occupied. Lets renderers find the segments in a
+        # region without walking the whole body.
+        self.cell_slots = array('i', bytes(4 * self.capacity))
+        self.free_cells = FreeCellIndex(self.capacity)
+        self.head_slot = 0
+        self.length = 0
+        self.reset()
+
+    def _release(self):
+        # Free the old body in O(length) so the buffers can be reused
+        for k in range(self.head_slot, self.head_slot - self.length, -1):
+            cell = self.cells[k]
+            if self.occupied[cell]:
+                self.occupied[cell] = 0
+                self.free_cells.add(cell)
+
+    def reset(self, head: Optional[Tuple[int, int]] = None):
+        """Start over as a single segment at head, by default the board center"""
+        self._release()
+        if head is None:
+            head = (self.width // 2, self.height // 2)
+        self.head_x, self.head_y = head
+        self.head_slot = 0
+        self.length = 1
+        self.cells[0] = self.head_y * self.width + self.head_x
+        self.occupied[self.cells[0]] = 1
+        self.cell_slots[self.cells[0]] = 0
+        self.free_cells.remove(self.cells[0])
+
+        self.direction = Direction.RIGHT
+        self.grow = False
+        self.collided = False
+
+    def restore(self, body: Sequence[int], head_x: int, head_y: int, direction: Direction,
+                grow: bool, collided: bool):
+        """Rebuild the snake from its body cells, head first, in O(old + new length)"""
+        self._release()
+        self.length = len(body)
+        self.head_slot = self.length - 1
+        tail_first = array('i', body)
+        tail_first.reverse()
+        self.cells[:self.length] = tail_first
+        occupied, cell_slots, free_cells = self.occupied, self.cell_slots, self.free_cells
+        # A snake that ran into itself holds its head cell twice; like move(), the head slot wins
+        for slot, cell in enumerate(tail_first):
+            if not occupied[cell]:
+                occupied[cell] = 1
+                free_cells.remove(cell)
+            cell_slots[cell] = slot
+        self.head_x = head_x
+        self.head_y = head_y
+        self.direction = direction
+        self.grow = grow
+        self.collided = collided
+
+    def body_cells(self) -> array:
+        """Body cells head first, sliced out of the ring"""
+        start = self.head_slot - self.length + 1
+        if start >= 0:
+            body = self.cells[start:self.head_slot + 1]
+        else:
+            # Negative slots wrap around to the end of the ring
+            body = self.cells[start:] + self.cells[:self.head_slot + 1]
+        body.reverse()
+        return body
+
+    @property
+    def head(self) -> Tuple[int, int]:
+        return (self.head_x, self.head_y)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def segments(self) -> Iterator[Tuple[int, int]]:
+        # Head to tail; negative slots wrap around the ring
+        cells, width = self.cells, self.width
+        for k in range(self.head_slot, self.head_slot - self.length, -1):
+            cell = cells[k]
+            yield (cell % width, cell // width)
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        return self.occupied[y * self.width + x] == 1
+
+    def segment_index(self, cell: int) -> int:
+        """Position of the segment on an occupied cell, counting from the head"""
+        return (self.head_slot - self.cell_slots[cell]) % self.capacity
+
+    def move(self):
+        dx, dy = self.direction.value
+        x = self.head_x + dx
+        y = self.head_y + dy
+        self.head_x = x
+        self.head_y = y
+
+        # Wall collision leaves the body where it was
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            self.collided = True
+            return
+
+        if not self.grow:
+            # Free the tail first so the head may follow it into the same cell
+            tail = self.cells[self.head_slot - self.length + 1]
+            self.occupied[tail] = 0
+            self.free_cells.add(tail)
+        else:
+            self.length += 1
+            self.grow = False
+
+        cell = y * self.width + x
+        if self.occupied[cell]:
+            self.collided = True
+        else:
+            self.occupied[cell] = 1
+            self.free_cells.remove(cell)
+        self.head_slot = (self.head_slot + 1) % self.capacity
+        self.cells[self.head_slot] = cell
+        self.cell_slots[cell] = self.head_slot
+
+    def change_direction(self, new_direction: Direction):
+        if new_direction != OPPOSITE_DIRECTIONS[self.direction]:
+            self.direction = new_direction
+
+    def check_collision(self) -> bool:
+        return self.collided
+
+    def eat_food(self):
+        self.grow = True
+
+class Food:
+    def __init__(self, snake: Snake, rng: random.Random):
+        self.rng = rng
+        self.position = self.generate_position(snake)
+
+    def generate_position(self, snake: Snake) -> Optional[Tuple[int, int]]:
+        # None means the snake fills the whole board
+        cell = snake.free_cells.sample(self.rng)
+        if cell is None:
+            return None
+        return (cell % snake.width, cell // snake.width)
+
+class State(NamedTuple):
+    head: Tuple[int, int]
+    direction: Direction
+    length: int
+    food: Optional[Tuple[int, int]]
+    score: int
+    ticks: int
+
+class Snapshot(NamedTuple):
+    ticks: int
+    score: int
+    done: bool
+    won: bool
+    direction: Direction
+    grow: bool
+    collided: bool
+    head_x: int
+    head_y: int
+    body: Sequence[int]  # head first
+    food: Optional[Tuple[int, int]]
+    rng_state: tuple
+
+class Simulation:
+    def __init__(self, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT,
+                 seed: Optional[int] = None):
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.snake = Snake(width, height)
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> State:
+        if seed is not None:
+            self.rng.seed(seed)
+        self.snake.reset()
+        self.food = Food(self.snake, self.rng)
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+        self.won = False
+        return self.state()
+
+    def state(self) -> State:
+        snake = self.snake
+        return State((snake.head_x, snake.head_y), snake.direction, snake.length,
+                     self.food.position, self.score, self.ticks)
+
+    def snapshot(self) -> Snapshot:
+        snake = self.snake
+        return Snapshot(self.ticks, self.score, self.done, self.won, snake.direction,
+                        snake.grow, snake.collided, snake.head_x, snake.head_y,
+                        snake.body_cells(), self.food.position,
+                        self.rng.getstate())
+
+    def restore(self, snapshot: Snapshot):
+        self.snake.restore(snapshot.body, snapshot.head_x, snapshot.head_y,
+                           snapshot.direction, snapshot.grow, snapshot.collided)
+        self.food.position = snapshot.food
+        self.score = snapshot.score
+        self.ticks = snapshot.ticks
+        self.done = snapshot.done
+        self.won = snapshot.won
+        self.rng.setstate(snapshot.rng_state)
+
+    def step(self, action: Optional[Direction] = None) -> Tuple[State, int, bool]:
+        """Advance one tick; reward is the score gained this tick"""
+        if self.done:
+            return self.state(), 0, True
+
+        snake = self.snake
+        if action is not None:
+            snake.change_direction(action)
+        snake.move()
+        self.ticks += 1
+
+        reward = 0
+        if snake.collided:
+            self.done = True
+        elif (snake.head_x, snake.head_y) == self.food.position:
+            snake.eat_food()
+            reward = FOOD_REWARD
+            self.score += reward
+
+            # No free cell left means the board is full
+            self.food.position = self.food.generate_position(snake)
+            if self.food.position is None:
+                self.won = True
+                self.done = True
+
+        return self.state(), reward, self.done
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Localhost load test for the multiplayer Snake server
+Fills rooms with simulated clients running in separate processes, then
+reports server tick cost, tick jitter, traffic and achievable rooms per core
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import protocol
+from core import OPPOSITE_DIRECTIONS, Direction
+from netclient import RemoteRoom
+from server import ROOM_CAPACITY, Server
+
+HOST = '127.0.0.1'
+TURN_PROBABILITY = 0.1
+JOIN_TIMEOUT = 30.0
+
+def raise_file_limit():
+    # Every simulated client is a socket on both ends
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+def choose_turn(room: RemoteRoom, rng: random.Random) -> Optional[Direction]:
+    """Keep going unless the next cell is a wall or our own body, with the odd random turn"""
+    snake = room.snake
+
+    def safe(direction) -> bool:
+        x = snake.head_x + direction.value[0]
+        y = snake.head_y + direction.value[1]
+        return 0 <= x < room.width and 0 <= y < room.height and not snake.occupied[y * room.width + x]
+
+    if safe(snake.direction) and rng.random() >= TURN_PROBABILITY:
+        return None
+    options = [d for d in protocol.DIRECTIONS if d != OPPOSITE_DIRECTIONS[snake.direction] and safe(d)]
+    return rng.choice(options) if options else None
+
+async def simulated_client(port: int, room_id: int, seed: int, totals: Dict[str, int]):
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(protocol.encode_join(room_id))
+    rng = random.Random(seed)
+    frames = protocol.FrameReader()
+    room = None
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            totals['bytes'] += len(data)
+            for message_type, body in frames.feed(data):
+                if message_type == protocol.SNAPSHOT:
+                    if room is None:
+                        room = RemoteRoom(body)
+                    else:
+                        room.apply_snapshot(body)
+                    totals['snapshots'] += 1
+                elif message_type == protocol.TICK and room is not None:
+                    room.apply_tick(body)
+                    totals['ticks'] += 1
+                    if room.needs_sync:
+                        room.needs_sync = False
+                        writer.write(protocol.frame(protocol.SYNC))
+                    elif room.done:
+                        writer.write(protocol.frame(protocol.RESPAWN))
+                    else:
+                        direction = choose_turn(room, rng)
+                        if direction is not None:
+                            writer.write(protocol.encode_turn(direction))
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        if room is not None:
+            totals['desyncs'] += room.desyncs
+
+def client_process(port: int, room_ids: List[int], seed: int, results: multiprocessing.Queue):
+    """Run a share of the simulated clients until the server hangs up"""
+    raise_file_limit()
+    totals = {'bytes': 0, 'ticks': 0, 'snapshots': 0, 'desyncs': 0}
+
+    async def run():
+        await asyncio.gather(*(simulated_client(port, room_id, seed + i, totals)
+                               for i, room_id in enumerate(room_ids)))
+
+    asyncio.run(run())
+    results.put(totals)
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, float]:
+    raise_file_limit()
+    server = Server(args.tick_rate, seed=args.seed)
+    listener = await server.start(HOST, 0)
+    port = listener.sockets[0].getsockname()[1]
+
+    # Client i joins room i // players; the processes split the clients evenly
+    room_ids = [i // args.players for i in range(args.rooms * args.players)]
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = []
+    for index in range(args.client_processes):
+        share = room_ids[index::args.client_processes]
+        process = context.Process(target=client_process,
+                                  args=(port, share, args.seed + index * len(room_ids), results))
+        process.start()
+        processes.append(process)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + JOIN_TIMEOUT
+    while server.players < len(room_ids):
+        if loop.time() > deadline:
+            raise RuntimeError(f"only {server.players} of {len(room_ids)} clients joined")
+        await asyncio.sleep(0.1)
+    await asyncio.sleep(args.warmup)
+
+    # Measure: server CPU over wall time is the share of one core the rooms need
+    server.reset_stats()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.sleep(args.duration)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    stats = server.stats()
+    snapshot_bytes = sum(len(room.snapshot(next(iter(room.players.values()))))
+                         for room in server.rooms.values()) / max(1, len(server.rooms))
+
+    # Hanging up ends the clients, which then report what they saw
+    server.scheduler.cancel()
+    listener.close()
+    for connection in list(server.connections):
+        server.disconnect(connection)
+    totals = {'bytes': 0, 'ticks': 0, 'snapshots': 0, 'desyncs': 0}
+    for _ in processes:
+        for key, value in (await loop.run_in_executor(None, results.get)).items():
+            totals[key] += value
+    for process in processes:
+        process.join()
+
+    interval_ms = 1000 / args.tick_rate
+    core_share = cpu / wall
+    clients = len(room_ids)
+    stats.update({
+        'clients': clients,
+        'tick_rate': args.tick_rate,
+        'duration_s': wall,
+        'cpu_share': core_share,
+        'rooms_per_core': args.rooms / core_share if core_share else 0.0,
+        'rooms_per_core_p99_tick': args.rooms * interval_ms / stats['busy_p99_ms'] if stats['busy_p99_ms'] else 0.0,
+        'bytes_per_client_tick': stats['bytes_sent'] / (clients * stats['ticks']) if stats['ticks'] else 0.0,
+        'snapshot_bytes': snapshot_bytes,
+        'client_ticks': totals['ticks'],
+        'client_snapshots': totals['snapshots'],
+        'client_desyncs': totals['desyncs'],
+    })
+    return stats
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the multiplayer Snake server on localhost")
+    parser.add_argument('--rooms', type=int, default=100)
+    parser.add_argument('--players', type=int, default=ROOM_CAPACITY, help="simulated clients per room")
+    parser.add_argument('--duration', type=float, default=10.0, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=2.0, help="seconds to run before measuring")
+    parser.add_argument('--tick-rate', type=float, default=10.0)
+    parser.add_argument('--client-processes', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="processes running the simulated clients")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="also write the results as JSON")
+    args = parser.parse_args(argv)
+    if not 1 <= args.players <= ROOM_CAPACITY:
+        parser.error(f"--players must be between 1 and {ROOM_CAPACITY}")
+    if args.rooms < 1 or args.client_processes < 1:
+        parser.error("--rooms and --client-processes must be positive")
+    return args
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    stats = asyncio.run(run_load_test(args))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(stats, f, indent=2)
+
+    print(f"🐍 {args.rooms} rooms x {args.players} players, {stats['ticks']} ticks "
+          f"at {args.tick_rate:g}/s over {stats['duration_s']:.1f}s")
+    print(f"   tick    mean {stats['busy_mean_ms']:.2f} ms  p99 {stats['busy_p99_ms']:.2f} ms  "
+          f"budget {1000 / args.tick_rate:.0f} ms  overruns {stats['overruns']}")
+    print(f"   jitter  p50 {stats['jitter_p50_ms']:.2f} ms  p99 {stats['jitter_p99_ms']:.2f} ms  "
+          f"max {stats['jitter_max_ms']:.2f} ms")
+    print(f"   server  {stats['cpu_share']:.0%} of one core  ->  ~{stats['rooms_per_core']:.0f} rooms per core "
+          f"(~{stats['rooms_per_core_p99_tick']:.0f} by p99 tick time)")
+    print(f"   traffic {stats['bytes_per_client_tick']:.1f} B per client per tick  "
+          f"(full snapshot {stats['snapshot_bytes']:.0f} B)")
+    print(f"   clients {stats['client_ticks']} ticks applied  {stats['client_desyncs']} desyncs  "
+          f"{stats['dropped']} dropped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,12 +1,25 @@
+import time
+
+# Cold start is measured from here, before the heavy imports (--startup-time)
+IMPORT_START = time.perf_counter()
+
 import pygame
-import random
+import numpy as np
+import argparse
 import math
+import os
+import random
 import sys
-from enum import Enum
-from typing import List, Tuple
+from collections import OrderedDict, deque
+from functools import cached_property
+from typing import Callable, List, Optional, Tuple
 
-# Initialize Pygame
-pygame.init()
+from bots import AutopilotPolicy
+from core import OPPOSITE_DIRECTIONS, Direction, Simulation, Snake
+from netclient import NetClient
+from profiler import FrameProfiler
+from protocol import ATE, DIED, HEAD
+from replay import Replay
 
 # Constants
 WINDOW_WIDTH = 1000
@@ -15,9 +28,33 @@ GRID_SIZE = 20
 GRID_WIDTH = WINDOW_WIDTH // GRID_SIZE
 GRID_HEIGHT = WINDOW_HEIGHT // GRID_SIZE
 
+# Larger boards scroll with a camera that follows the head; smaller ones are centered
+MAX_BOARD_SIZE = 2000
+BORDER_WIDTH = 3
+
+# Timing: the simulation ticks at TICK_RATE while frames render at the display rate
+TICK_RATE = 10
+DEFAULT_FRAME_RATE = 60
+MAX_FRAME_TIME = 0.25  # seconds; longer stalls are dropped instead of replayed
+
+# Replays: arrow keys seek by this many ticks during playback
+REPLAY_SEEK_TICKS = 50
+
+# Online play: server.py's default port
+DEFAULT_SERVER_PORT = 7777
+
+# Input: turns queued ahead of the simulation, one applied per tick
+INPUT_QUEUE_SIZE = 3
+LATENCY_SAMPLES = 256
+
+# Autopilot: ticks on the game over screen before it starts the next game
+AUTOPILOT_RESTART_TICKS = 10
+
 # Colors with glamorous palette
 BACKGROUND_COLOR = (15, 15, 35)  # Dark blue
 GRID_COLOR = (25, 25, 45)
+OUTSIDE_COLOR = (6, 6, 16)          # Window area beyond the board edges
+BORDER_COLOR = (120, 60, 160)       # The walls around the board
 SNAKE_HEAD_COLOR = (255, 100, 255)  # Bright magenta
 SNAKE_BODY_COLOR = (200, 50, 200)   # Purple
 SNAKE_GLOW_COLOR = (255, 150, 255)  # Light magenta
@@ -25,321 +62,938 @@ FOOD_COLOR = (255, 215, 0)          # Gold
 FOOD_GLOW_COLOR = (255, 255, 100)   # Light yellow
 TEXT_COLOR = (255, 255, 255)
 ACCENT_COLOR = (0, 255, 255)        # Cyan
+RIVAL_COLOR = (0, 200, 220)         # Teal, for other players' snakes
 
-class Direction(Enum):
-    UP = (0, -1)
-    DOWN = (0, 1)
-    LEFT = (-1, 0)
-    RIGHT = (1, 0)
-
-class Particle:
-    def __init__(self, x: float, y: float, color: Tuple[int, int, int]):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-2, 2)
-        self.life = 60
-        self.max_life = 60
-        self.color = color
-        self.size = random.uniform(2, 5)
+# Particles; life and speed are measured in steps of 1 / PARTICLE_STEP_RATE seconds
+PARTICLE_CAPACITY = 4096
+PARTICLE_STEP_RATE = 10
+PARTICLE_LIFE = 60
+PARTICLE_MIN_SIZE = 2
+PARTICLE_MAX_SIZE = 5
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.vx *= 0.98
-        self.vy *= 0.98
-
-    def draw(self, screen: pygame.Surface):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            size = int(self.size * (self.life / self.max_life))
-            if size > 0:
-                color_with_alpha = (*self.color, alpha)
-                temp_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(temp_surface, color_with_alpha, (size, size), size)
-                screen.blit(temp_surface, (self.x - size, self.y - size))
-
-class Snake:
+# Body segments past this index all share the darkest shade
+BODY_SHADE_STEPS = 20
+
+# Rendered text surfaces kept for reuse; HUD, stats and game over lines fit easily
+TEXT_CACHE_SIZE = 128
+
+# Rendering: above this many dirty rects one full flip is cheaper than many small updates
+DIRTY_RECT_LIMIT = 250
+
+# Window events that mean the whole window has to be presented again
+EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+
+class ParticleSystem:
+    def __init__(self, capacity: int = PARTICLE_CAPACITY,
+                 rng: Optional[np.random.Generator] = None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Structure of arrays; live particles are packed into [0, count)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int8)
+
+        # atlas[color][life][size] -> pre-rendered particle sprite
+        self.colors = {}
+        self.atlas = []
+
+    def clear(self):
+        self.count = 0
+
+    def register_color(self, color: Tuple[int, int, int]) -> int:
+        color_id = self.colors.get(color)
+        if color_id is None:
+            color_id = len(self.atlas)
+            self.colors[color] = color_id
+            self.atlas.append(self._bake(color))
+        return color_id
+
+    def _bake(self, color: Tuple[int, int, int]) -> List[List[pygame.Surface]]:
+        by_life = [[]]
+        for life in range(1, PARTICLE_LIFE + 1):
+            alpha = int(255 * (life / PARTICLE_LIFE))
+            sprites = [None]
+            for size in range(1, PARTICLE_MAX_SIZE + 1):
+                sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, (*color, alpha), (size, size), size)
+                sprites.append(sprite)
+            by_life.append(sprites)
+        return by_life
+
+    def emit(self, x: float, y: float, color: Tuple[int, int, int], count: int):
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        color_id = self.register_color(color)
+        start, end = self.count, self.count + count
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-2, 2, count)
+        self.vy[start:end] = self.rng.uniform(-2, 2, count)
+        self.life[start:end] = PARTICLE_LIFE
+        self.size[start:end] = self.rng.uniform(PARTICLE_MIN_SIZE, PARTICLE_MAX_SIZE, count)
+        self.color[start:end] = color_id
+        self.count = end
+
+    def update(self, steps: float = 1.0):
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n] * steps
+        self.y[:n] += self.vy[:n] * steps
+        drag = 0.98 ** steps
+        self.vx[:n] *= drag
+        self.vy[:n] *= drag
+        self.life[:n] -= steps
+
+        alive = self.life[:n] > 0
+        live_count = int(np.count_nonzero(alive))
+        if live_count < n:
+            for field in (self.x, self.y, self.vx, self.vy, self.life, self.size, self.color):
+                field[:live_count] = field[:n][alive]
+            self.count = live_count
+
+    def draw(self, screen: pygame.Surface, camera: Tuple[int, int] = (0, 0)) -> List[pygame.Rect]:
+        n = self.count
+        if n == 0:
+            return []
+        life = np.ceil(self.life[:n]).astype(np.int32)
+        sizes = (self.size[:n] * life / PARTICLE_LIFE).astype(np.int32)
+        xs = (self.x[:n] - sizes - camera[0]).astype(np.int32)
+        ys = (self.y[:n] - sizes - camera[1]).astype(np.int32)
+
+        # Only particles that are alive and on screen
+        width, height = screen.get_size()
+        margin = 2 * PARTICLE_MAX_SIZE
+        visible = np.flatnonzero((sizes > 0) & (xs > -margin) & (xs < width) &
+                                 (ys > -margin) & (ys < height))
+        if visible.size == 0:
+            return []
+        atlas = self.atlas
+        rects = screen.blits([
+            (atlas[c][l][s], (px, py))
+            for c, l, s, px, py in zip(self.color[visible].tolist(), life[visible].tolist(),
+                                       sizes[visible].tolist(), xs[visible].tolist(),
+                                       ys[visible].tolist())
+        ])
+        # Bursts are local, so one bounding rect covers them without thousands of tiny ones
+        return [rects[0].unionall(rects)]
+
+class InputQueue:
+    def __init__(self, size: int = INPUT_QUEUE_SIZE):
+        self.size = size
+        self.pending = deque()
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.dropped = 0
+
+    def clear(self):
+        self.pending.clear()
+
+    def push(self, direction: Direction, current: Direction, timestamp: float) -> bool:
+        # Validate against the last queued turn so quick UP-then-LEFT both survive
+        last = self.pending[-1][0] if self.pending else current
+        if direction == last or direction == OPPOSITE_DIRECTIONS[last]:
+            return False
+        if len(self.pending) >= self.size:
+            self.dropped += 1
+            return False
+        self.pending.append((direction, timestamp))
+        return True
+
+    def pop(self, now: float) -> Optional[Direction]:
+        if not self.pending:
+            return None
+        direction, timestamp = self.pending.popleft()
+        self.latencies.append(now - timestamp)
+        return direction
+
+    def stats(self) -> str:
+        if not self.latencies:
+            return f"Input latency: -  dropped: {self.dropped}"
+        ordered = sorted(self.latencies)
+        mean = sum(ordered) / len(ordered)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return (f"Input latency ms  mean: {mean * 1000:.0f}  p95: {p95 * 1000:.0f}  "
+                f"max: {ordered[-1] * 1000:.0f}  dropped: {self.dropped}")
+
+class SpriteCache:
     def __init__(self):
-        self.body = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = Direction.RIGHT
-        self.grow = False
-        self.trail_positions = []
-
-    def move(self):
-        head = self.body[0]
-        new_head = (
-            head[0] + self.direction.value[0],
-            head[1] + self.direction.value[1]
-        )
-        
-        self.trail_positions.append((head[0] * GRID_SIZE + GRID_SIZE // 2, 
-                                   head[1] * GRID_SIZE + GRID_SIZE // 2))
-        if len(self.trail_positions) > 20:
-            self.trail_positions.pop(0)
-        
-        self.body.insert(0, new_head)
-        
-        if not self.grow:
-            self.body.pop()
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            self.misses += 1
+            sprite = build()
+            self.sprites[key] = sprite
         else:
-            self.grow = False
-
-    def change_direction(self, new_direction: Direction):
-        opposite_directions = {
-            Direction.UP: Direction.DOWN,
-            Direction.DOWN: Direction.UP,
-            Direction.LEFT: Direction.RIGHT,
-            Direction.RIGHT: Direction.LEFT
-        }
-        
-        if new_direction != opposite_directions.get(self.direction):
-            self.direction = new_direction
+            self.hits += 1
+        return sprite
 
-    def check_collision(self) -> bool:
-        head = self.body[0]
-        
-        # Wall collision
-        if (head[0] < 0 or head[0] >= GRID_WIDTH or 
-            head[1] < 0 or head[1] >= GRID_HEIGHT):
-            return True
-        
-        # Self collision
-        if head in self.body[1:]:
-            return True
-        
-        return False
-
-    def eat_food(self):
-        self.grow = True
-
-    def draw(self, screen: pygame.Surface, particles: List[Particle]):
-        # Draw trail
-        for i, pos in enumerate(self.trail_positions):
-            alpha = int(50 * (i / len(self.trail_positions)))
-            if alpha > 0:
-                trail_surface = pygame.Surface((6, 6), pygame.SRCALPHA)
-                pygame.draw.circle(trail_surface, (*SNAKE_GLOW_COLOR, alpha), (3, 3), 3)
-                screen.blit(trail_surface, (pos[0] - 3, pos[1] - 3))
-
-        # Draw snake body with glow effect
-        for i, segment in enumerate(self.body):
-            x = segment[0] * GRID_SIZE
-            y = segment[1] * GRID_SIZE
-            
-            # Glow effect
-            glow_surface = pygame.Surface((GRID_SIZE + 10, GRID_SIZE + 10), pygame.SRCALPHA)
-            if i == 0:  # Head
-                pygame.draw.circle(glow_surface, (*SNAKE_GLOW_COLOR, 50), 
-                                 (GRID_SIZE // 2 + 5, GRID_SIZE // 2 + 5), GRID_SIZE // 2 + 5)
-                screen.blit(glow_surface, (x - 5, y - 5))
-                
-                # Head with gradient
-                pygame.draw.circle(screen, SNAKE_HEAD_COLOR, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), GRID_SIZE // 2)
-                pygame.draw.circle(screen, (255, 255, 255), (x + GRID_SIZE // 2 - 3, y + GRID_SIZE // 2 - 3), 3)
-            else:  # Body
-                body_color = tuple(int(c * (1 - i * 0.05)) for c in SNAKE_BODY_COLOR)
-                pygame.draw.circle(glow_surface, (*SNAKE_GLOW_COLOR, 30), 
-                                 (GRID_SIZE // 2 + 5, GRID_SIZE // 2 + 5), GRID_SIZE // 2 + 3)
-                screen.blit(glow_surface, (x - 5, y - 5))
-                pygame.draw.circle(screen, body_color, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), GRID_SIZE // 2 - 1)
-
-class Food:
-    def __init__(self):
-        self.position = self.generate_position()
-        self.pulse = 0
+    def warm(self):
+        # Pre-render every sprite the snake and food can ask for
+        self.head()
+        for i in range(1, BODY_SHADE_STEPS + 1):
+            self.body(i)
+        for alpha in range(1, 50):
+            self.trail(alpha)
+        for pulse_size in range(-3, 4):
+            self.food(pulse_size)
+        self.rival(True)
+        self.rival(False)
 
-    def generate_position(self) -> Tuple[int, int]:
-        return (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
+    def stats(self) -> str:
+        return f"Sprites: {len(self.sprites)}  hits: {self.hits}  misses: {self.misses}"
 
-    def draw(self, screen: pygame.Surface):
-        x = self.position[0] * GRID_SIZE
-        y = self.position[1] * GRID_SIZE
-        
-        # Pulsing effect
-        self.pulse += 0.2
-        pulse_size = int(3 * math.sin(self.pulse))
-        
-        # Glow effect
-        glow_surface = pygame.Surface((GRID_SIZE + 20, GRID_SIZE + 20), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (*FOOD_GLOW_COLOR, 80), 
-                         (GRID_SIZE // 2 + 10, GRID_SIZE // 2 + 10), GRID_SIZE // 2 + 10)
-        screen.blit(glow_surface, (x - 10, y - 10))
-        
-        # Food with pulsing
-        pygame.draw.circle(screen, FOOD_COLOR, 
-                         (x + GRID_SIZE // 2, y + GRID_SIZE // 2), 
-                         GRID_SIZE // 2 + pulse_size)
-        pygame.draw.circle(screen, (255, 255, 255), 
-                         (x + GRID_SIZE // 2 - 2, y + GRID_SIZE // 2 - 2), 2)
+    def head(self) -> pygame.Surface:
+        return self.get(("head",), self._build_head)
+
+    def body(self, index: int) -> pygame.Surface:
+        # Shades bottom out at black after BODY_SHADE_STEPS segments
+        index = min(index, BODY_SHADE_STEPS)
+        return self.get(("body", index), lambda: self._build_body(index))
+
+    def trail(self, alpha: int) -> pygame.Surface:
+        return self.get(("trail", alpha), lambda: self._build_trail(alpha))
+
+    def food(self, pulse_size: int) -> pygame.Surface:
+        return self.get(("food", pulse_size), lambda: self._build_food(pulse_size))
+
+    def rival(self, head: bool) -> pygame.Surface:
+        return self.get(("rival", head), lambda: self._build_rival(head))
+
+    def _build_head(self) -> pygame.Surface:
+        center = (GRID_SIZE // 2 + 5, GRID_SIZE // 2 + 5)
+        sprite = pygame.Surface((GRID_SIZE + 10, GRID_SIZE + 10), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*SNAKE_GLOW_COLOR, 50), center, GRID_SIZE // 2 + 5)
+        pygame.draw.circle(sprite, SNAKE_HEAD_COLOR, center, GRID_SIZE // 2)
+        pygame.draw.circle(sprite, (255, 255, 255), (center[0] - 3, center[1] - 3), 3)
+        return sprite
+
+    def _build_body(self, index: int) -> pygame.Surface:
+        center = (GRID_SIZE // 2 + 5, GRID_SIZE // 2 + 5)
+        body_color = tuple(max(0, int(c * (1 - index * 0.05))) for c in SNAKE_BODY_COLOR)
+        sprite = pygame.Surface((GRID_SIZE + 10, GRID_SIZE + 10), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*SNAKE_GLOW_COLOR, 30), center, GRID_SIZE // 2 + 3)
+        pygame.draw.circle(sprite, body_color, center, GRID_SIZE // 2 - 1)
+        return sprite
+
+    def _build_trail(self, alpha: int) -> pygame.Surface:
+        sprite = pygame.Surface((6, 6), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*SNAKE_GLOW_COLOR, alpha), (3, 3), 3)
+        return sprite
+
+    def _build_rival(self, head: bool) -> pygame.Surface:
+        center = (GRID_SIZE // 2 + 5, GRID_SIZE // 2 + 5)
+        sprite = pygame.Surface((GRID_SIZE + 10, GRID_SIZE + 10), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*RIVAL_COLOR, 40), center, GRID_SIZE // 2 + 3)
+        pygame.draw.circle(sprite, ACCENT_COLOR if head else RIVAL_COLOR, center, GRID_SIZE // 2 - 1)
+        if head:
+            pygame.draw.circle(sprite, (255, 255, 255), (center[0] - 3, center[1] - 3), 3)
+        return sprite
+
+    def _build_food(self, pulse_size: int) -> pygame.Surface:
+        center = (GRID_SIZE // 2 + 10, GRID_SIZE // 2 + 10)
+        sprite = pygame.Surface((GRID_SIZE + 20, GRID_SIZE + 20), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*FOOD_GLOW_COLOR, 80), center, GRID_SIZE // 2 + 10)
+        pygame.draw.circle(sprite, FOOD_COLOR, center, GRID_SIZE // 2 + pulse_size)
+        pygame.draw.circle(sprite, (255, 255, 255), (center[0] - 2, center[1] - 2), 2)
+        return sprite
+
+class TextCache:
+    def __init__(self, capacity: int = TEXT_CACHE_SIZE):
+        # Least recently used entries are evicted first
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int],
+               antialias: bool = True) -> pygame.Surface:
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = font.render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def stats(self) -> str:
+        return f"Text: {len(self.surfaces)}  hits: {self.hits}  misses: {self.misses}"
+
+KEY_DIRECTIONS = {
+    pygame.K_UP: Direction.UP,
+    pygame.K_w: Direction.UP,
+    pygame.K_DOWN: Direction.DOWN,
+    pygame.K_s: Direction.DOWN,
+    pygame.K_LEFT: Direction.LEFT,
+    pygame.K_a: Direction.LEFT,
+    pygame.K_RIGHT: Direction.RIGHT,
+    pygame.K_d: Direction.RIGHT
+}
 
 class Game:
-    def __init__(self):
+    def __init__(self, tick_rate: float = TICK_RATE, frame_rate: Optional[int] = None,
+                 seed: Optional[int] = None, record_path: Optional[str] = None,
+                 replay: Optional[Replay] = None, profile_path: Optional[str] = None,
+                 board_size: Optional[Tuple[int, int]] = None, client: Optional[NetClient] = None,
+                 autopilot: bool = False):
+        self.startup_marks = [("imports", time.perf_counter())]
+        
+        # Only what the game uses: pygame.init() would also start audio and joysticks
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Glamorous Snake Game")
+        self.startup_marks.append(("window", time.perf_counter()))
         self.clock = pygame.time.Clock()
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 24)
+        self.tick_rate = tick_rate
+        self.frame_rate = frame_rate or self.detect_refresh_rate()
+        # Sprites are built on first use; run() warms the rest after the first frame
+        self.sprites = SpriteCache()
+        self.text_cache = TextCache()
         
-        self.snake = Snake()
-        self.food = Food()
-        self.score = 0
-        self.high_score = 0
-        self.game_over = False
-        self.particles = []
+        # Game over screen, composited once per final score
+        self.game_over_overlay = None
+        self.game_over_key = None
+        
+        # Dirty-rect rendering: rects drawn last frame are restored from the background
+        self.background = self.build_background()
+        self.dirty_rects: List[pygame.Rect] = []
+        self.full_redraw = True
+        
+        # Replays and server rooms bring their own board size
+        if replay is not None:
+            board_size = (replay.width, replay.height)
+        elif client is not None:
+            board_size = (client.room.width, client.room.height)
+        self.board_width, self.board_height = board_size or (GRID_WIDTH, GRID_HEIGHT)
+        self.world_width = self.board_width * GRID_SIZE
+        self.world_height = self.board_height * GRID_SIZE
+        self.scrolling = self.world_width > WINDOW_WIDTH or self.world_height > WINDOW_HEIGHT
+        self.camera = (0, 0)
+        self.drawn_camera = None
+        self.frame_rects: List[Tuple[Tuple[int, int, int], pygame.Rect]] = []
+        self.show_stats = False
+        self.input_queue = InputQueue()
         
-        # Ensure food doesn't spawn on snake
-        while self.food.position in self.snake.body:
-            self.food.position = self.food.generate_position()
+        # Profiling runs while the overlay is shown, or all session when exporting
+        self.profile_path = profile_path
+        self.show_profiler = False
+        self.profiler = FrameProfiler(enabled=profile_path is not None,
+                                      budget_ms=1000 / self.frame_rate)
+        
+        # Every random choice comes from seeded generators so games can be replayed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.games_played = 0
+        self.record_path = record_path
+        self.recording = None
+        self.replay = replay
+        
+        # The autopilot steers instead of the keys and plays game after game, for soak tests
+        self.autopilot = AutopilotPolicy(self.seed)
+        self.autopilot_enabled = autopilot and replay is None
+        self.restart_ticks = 0
+        
+        # Online, the server runs the game and the room mirror stands in for the simulation
+        self.client = client
+        self.sim = client.room if client is not None else Simulation(self.board_width, self.board_height)
+        self.high_score = 0
+        self.trail_positions = deque(maxlen=20)
+        self.previous_length = 0
+        self.food_pulse = 0
+        self.particles = ParticleSystem(rng=np.random.default_rng(self.seed))
+        self.particles.register_color(FOOD_COLOR)
+        self.particles.register_color(SNAKE_HEAD_COLOR)
+        self.start_game()
+        self.startup_marks.append(("setup", time.perf_counter()))
+
+    # Fonts load on first use; the large one only appears on the game over screen
+
+    @cached_property
+    def font_large(self) -> pygame.font.Font:
+        return pygame.font.Font(None, 48)
+
+    @cached_property
+    def font_medium(self) -> pygame.font.Font:
+        return pygame.font.Font(None, 36)
+
+    @cached_property
+    def font_small(self) -> pygame.font.Font:
+        return pygame.font.Font(None, 24)
+
+    @staticmethod
+    def detect_refresh_rate() -> int:
+        # Only newer pygame builds can report the monitor refresh rate
+        get_rate = getattr(pygame.display, "get_current_refresh_rate", None)
+        rate = get_rate() if get_rate else 0
+        return rate or DEFAULT_FRAME_RATE
+
+    @property
+    def snake(self):
+        return self.sim.snake
+
+    @property
+    def food(self):
+        return self.sim.food
+
+    @property
+    def score(self) -> int:
+        return self.sim.score
+
+    @property
+    def game_over(self) -> bool:
+        return self.sim.done
+
+    @property
+    def won(self) -> bool:
+        return self.sim.won
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            elif event.type in EXPOSE_EVENTS:
+                self.full_redraw = True
             elif event.type == pygame.KEYDOWN:
-                if self.game_over:
+                if event.key == pygame.K_F3:
+                    self.show_stats = not self.show_stats
+                elif event.key == pygame.K_F2:
+                    self.show_profiler = not self.show_profiler
+                    self.profiler.enable(self.show_profiler or self.profile_path is not None)
+                elif self.replay is not None:
+                    if event.key == pygame.K_ESCAPE:
+                        return False
+                    elif event.key == pygame.K_SPACE:
+                        self.seek(0)
+                    elif event.key == pygame.K_LEFT:
+                        self.seek(self.sim.ticks - REPLAY_SEEK_TICKS)
+                    elif event.key == pygame.K_RIGHT:
+                        self.seek(self.sim.ticks + REPLAY_SEEK_TICKS)
+                elif event.key == pygame.K_F4:
+                    self.autopilot_enabled = not self.autopilot_enabled
+                elif self.game_over:
                     if event.key == pygame.K_SPACE:
                         self.restart_game()
                     elif event.key == pygame.K_ESCAPE:
                         return False
-                else:
-                    if event.key == pygame.K_UP or event.key == pygame.K_w:
-                        self.snake.change_direction(Direction.UP)
-                    elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                        self.snake.change_direction(Direction.DOWN)
-                    elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                        self.snake.change_direction(Direction.LEFT)
-                    elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                        self.snake.change_direction(Direction.RIGHT)
+                elif event.key in KEY_DIRECTIONS and self.client is not None:
+                    self.autopilot_enabled = False
+                    self.client.turn(KEY_DIRECTIONS[event.key])
+                elif event.key in KEY_DIRECTIONS:
+                    # Steering takes over from the autopilot
+                    self.autopilot_enabled = False
+                    self.input_queue.push(KEY_DIRECTIONS[event.key], self.snake.direction,
+                                          time.perf_counter())
         return True
 
     def update(self):
-        if not self.game_over:
-            self.snake.move()
+        # Segments that slide over from last tick's cells when drawn; 0 once the snake stops
+        self.previous_length = 0
+        if self.game_over:
+            if self.autopilot_enabled:
+                self.autopilot_restart()
+        else:
+            length = self.snake.length
+            head_slot = self.snake.head_slot
+            head = self.snake.head
+            food_position = self.food.position
             
-            # Check food collision
-            if self.snake.body[0] == self.food.position:
-                self.snake.eat_food()
-                self.score += 10
-                
-                # Create particles
-                food_x = self.food.position[0] * GRID_SIZE + GRID_SIZE // 2
-                food_y = self.food.position[1] * GRID_SIZE + GRID_SIZE // 2
-                for _ in range(15):
-                    self.particles.append(Particle(food_x, food_y, FOOD_COLOR))
-                
-                # Generate new food
-                self.food.position = self.food.generate_position()
-                while self.food.position in self.snake.body:
-                    self.food.position = self.food.generate_position()
+            if self.replay is not None:
+                if self.sim.ticks >= self.replay.ticks:
+                    return
+                action = self.replay.direction_at(self.sim.ticks)
+            elif self.autopilot_enabled:
+                action = self.autopilot(self.sim)
+            else:
+                # One queued turn per tick; latency runs from key poll to the applied move
+                action = self.input_queue.pop(time.perf_counter())
+            
+            _, reward, done = self.sim.step(action)
+            self.trail_positions.append((head[0] * GRID_SIZE + GRID_SIZE // 2,
+                                         head[1] * GRID_SIZE + GRID_SIZE // 2))
+            if self.recording is not None:
+                self.recording.add_tick(self.sim)
+            
+            # A wall hit leaves the body where it was, so only a real move slides
+            if self.snake.head_slot != head_slot:
+                self.previous_length = length
             
-            # Check collisions
-            if self.snake.check_collision():
-                self.game_over = True
+            if reward:
+                # Food particles
+                food_x = food_position[0] * GRID_SIZE + GRID_SIZE // 2
+                food_y = food_position[1] * GRID_SIZE + GRID_SIZE // 2
+                self.particles.emit(food_x, food_y, FOOD_COLOR, 15)
+            
+            if done:
                 if self.score > self.high_score:
                     self.high_score = self.score
                 
-                # Death particles
-                head = self.snake.body[0]
-                head_x = head[0] * GRID_SIZE + GRID_SIZE // 2
-                head_y = head[1] * GRID_SIZE + GRID_SIZE // 2
-                for _ in range(30):
-                    self.particles.append(Particle(head_x, head_y, SNAKE_HEAD_COLOR))
+                if not self.won:
+                    # Death particles
+                    head = self.snake.head
+                    head_x = head[0] * GRID_SIZE + GRID_SIZE // 2
+                    head_y = head[1] * GRID_SIZE + GRID_SIZE // 2
+                    self.particles.emit(head_x, head_y, SNAKE_HEAD_COLOR, 30)
+
+    def update_remote(self, flags: int):
+        """Effects for one server tick, after the client applied it to the room"""
+        room = self.sim
+        snake = self.snake
+        self.previous_length = room.previous_lengths.get(room.player_id, 0)
+        head_x = snake.head_x * GRID_SIZE + GRID_SIZE // 2
+        head_y = snake.head_y * GRID_SIZE + GRID_SIZE // 2
+        if flags & HEAD:
+            cell = snake.cells[snake.head_slot - 1]
+            self.trail_positions.append(((cell % snake.width) * GRID_SIZE + GRID_SIZE // 2,
+                                         (cell // snake.width) * GRID_SIZE + GRID_SIZE // 2))
+        if flags & ATE:
+            self.particles.emit(head_x, head_y, FOOD_COLOR, 15)
+        if flags & DIED:
+            self.previous_length = 0
+            self.high_score = max(self.high_score, self.score)
+            self.particles.emit(head_x, head_y, SNAKE_HEAD_COLOR, 30)
+
+    def steer_remote(self):
+        """Autopilot online: decide once per server tick and send only actual turns"""
+        if self.game_over:
+            self.autopilot_restart()
+            return
+        direction = self.autopilot(self.sim)
+        if direction is not None and direction != self.snake.direction:
+            self.client.turn(direction)
+
+    def autopilot_restart(self):
+        self.restart_ticks += 1
+        if self.restart_ticks >= AUTOPILOT_RESTART_TICKS:
+            self.restart_ticks = 0
+            self.restart_game()
+
+    def animate(self, dt: float):
+        # Per-frame effects, independent of the simulation tick rate
+        self.particles.update(dt * PARTICLE_STEP_RATE)
+        self.food_pulse += 2.0 * dt
+
+    def update_camera(self, alpha: float):
+        # Center on the interpolated head, clamped so the view stays on the board.
+        # A board narrower or shorter than the window is centered on that axis instead.
+        snake = self.snake
+        x, y = snake.head_x, snake.head_y
+        if self.previous_length:
+            cell = snake.cells[snake.head_slot - 1]
+            px, py = cell % snake.width, cell // snake.width
+            x = px + (x - px) * alpha
+            y = py + (y - py) * alpha
+        camera_x = int((x + 0.5) * GRID_SIZE) - WINDOW_WIDTH // 2
+        camera_y = int((y + 0.5) * GRID_SIZE) - WINDOW_HEIGHT // 2
+        if self.world_width < WINDOW_WIDTH:
+            camera_x = (self.world_width - WINDOW_WIDTH) // 2
+        else:
+            camera_x = max(0, min(camera_x, self.world_width - WINDOW_WIDTH))
+        if self.world_height < WINDOW_HEIGHT:
+            camera_y = (self.world_height - WINDOW_HEIGHT) // 2
+        else:
+            camera_y = max(0, min(camera_y, self.world_height - WINDOW_HEIGHT))
+        self.camera = (camera_x, camera_y)
+
+    def build_frame_rects(self) -> List[Tuple[Tuple[int, int, int], pygame.Rect]]:
+        # The parts of the window off the board: plain margins, then the walls just outside it.
+        # Only boards smaller than the window on some axis have any on screen.
+        window = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+        board = pygame.Rect(-self.camera[0], -self.camera[1], self.world_width, self.world_height)
+        walls = board.inflate(2 * BORDER_WIDTH, 2 * BORDER_WIDTH)
+        rects = [
+            (OUTSIDE_COLOR, pygame.Rect(0, 0, board.left, WINDOW_HEIGHT)),
+            (OUTSIDE_COLOR, pygame.Rect(board.right, 0, WINDOW_WIDTH - board.right, WINDOW_HEIGHT)),
+            (OUTSIDE_COLOR, pygame.Rect(board.left, 0, board.width, board.top)),
+            (OUTSIDE_COLOR, pygame.Rect(board.left, board.bottom, board.width, WINDOW_HEIGHT - board.bottom)),
+            (BORDER_COLOR, pygame.Rect(walls.left, walls.top, walls.width, BORDER_WIDTH)),
+            (BORDER_COLOR, pygame.Rect(walls.left, board.bottom, walls.width, BORDER_WIDTH)),
+            (BORDER_COLOR, pygame.Rect(walls.left, board.top, BORDER_WIDTH, board.height)),
+            (BORDER_COLOR, pygame.Rect(board.right, board.top, BORDER_WIDTH, board.height)),
+        ]
+        return [(color, rect.clip(window)) for color, rect in rects
+                if rect.width > 0 and rect.height > 0 and rect.colliderect(window)]
+
+    def build_background(self) -> pygame.Surface:
+        # The fill and grid never change, so they are drawn once and copied back each frame.
+        # One extra cell each way lets a scrolling camera copy it at any offset.
+        width = WINDOW_WIDTH + GRID_SIZE
+        height = WINDOW_HEIGHT + GRID_SIZE
+        background = pygame.Surface((width, height)).convert()
+        background.fill(BACKGROUND_COLOR)
+        for x in range(0, width, GRID_SIZE):
+            pygame.draw.line(background, GRID_COLOR, (x, 0), (x, height))
+        for y in range(0, height, GRID_SIZE):
+            pygame.draw.line(background, GRID_COLOR, (0, y), (width, y))
+        return background
+
+    def draw_snake(self, alpha: float) -> List[pygame.Rect]:
+        sprites = self.sprites
+        camera_x, camera_y = self.camera
+        blit_list = []
+
+        # Trail
+        trail_count = len(self.trail_positions)
+        for i, (x, y) in enumerate(self.trail_positions):
+            trail_alpha = int(50 * (i / trail_count))
+            x -= camera_x
+            y -= camera_y
+            if trail_alpha > 0 and -3 < x < WINDOW_WIDTH + 3 and -3 < y < WINDOW_HEIGHT + 3:
+                blit_list.append((sprites.trail(trail_alpha), (x - 3, y - 3)))
+
+        # Other players, then ours on top
+        if self.client is not None:
+            rival_head, rival_body = sprites.rival(True), sprites.rival(False)
+            for snake, previous_length in self.sim.others():
+                self.add_body(blit_list, snake, previous_length, alpha,
+                              lambda i: rival_head if i == 0 else rival_body)
+        self.add_body(blit_list, self.snake, self.previous_length, alpha,
+                      lambda i: sprites.head() if i == 0 else sprites.body(i))
+
+        return self.screen.blits(blit_list)
+
+    def add_body(self, blit_list: list, snake: Snake, previous_length: int, alpha: float,
+                 sprite_for: Callable[[int], pygame.Surface]):
+        camera_x, camera_y = self.camera
+
+        # Visible cells plus a one-cell margin for segments sliding in from outside
+        cells, width, head_slot = snake.cells, snake.width, snake.head_slot
+        left = max(0, camera_x // GRID_SIZE - 1)
+        right = min(width, (camera_x + WINDOW_WIDTH) // GRID_SIZE + 2)
+        top = max(0, camera_y // GRID_SIZE - 1)
+        bottom = min(snake.height, (camera_y + WINDOW_HEIGHT) // GRID_SIZE + 2)
+        if snake.length <= (right - left) * (bottom - top):
+            indices = range(snake.length)
+        else:
+            # Longer than the view: find the visible segments through the spatial index
+            occupied, segment_index = snake.occupied, snake.segment_index
+            indices = sorted(segment_index(cell)
+                             for row in range(top * width, bottom * width, width)
+                             for cell in range(row + left, row + right) if occupied[cell])
+
+        # Snake body with glow effect, head first. Each segment slides from the cell
+        # the segment ahead of it held last tick; one added by growing does not slide.
+        for i in indices:
+            cell = cells[head_slot - i]
+            x, y = cell % width, cell // width
+            if i < previous_length:
+                cell = cells[head_slot - 1 - i]
+                px, py = cell % width, cell // width
+                x = px + (x - px) * alpha
+                y = py + (y - py) * alpha
+            x = int(x * GRID_SIZE) - 5 - camera_x
+            y = int(y * GRID_SIZE) - 5 - camera_y
+            if -GRID_SIZE - 10 < x < WINDOW_WIDTH and -GRID_SIZE - 10 < y < WINDOW_HEIGHT:
+                blit_list.append((sprite_for(i), (x, y)))
+
+    def draw_food(self) -> List[pygame.Rect]:
+        position = self.food.position
+        if position is None:
+            return []
+        x = position[0] * GRID_SIZE - self.camera[0]
+        y = position[1] * GRID_SIZE - self.camera[1]
+        if not (-GRID_SIZE - 10 < x < WINDOW_WIDTH + 10 and -GRID_SIZE - 10 < y < WINDOW_HEIGHT + 10):
+            return []
+        
+        # Pulsing effect
+        pulse_size = int(3 * math.sin(self.food_pulse))
+        
+        return [self.screen.blit(self.sprites.food(pulse_size), (x - 10, y - 10))]
+
+    def draw_ui(self) -> List[pygame.Rect]:
+        render = self.text_cache.render
+        rects = []
         
-        # Update particles
-        self.particles = [p for p in self.particles if p.life > 0]
-        for particle in self.particles:
-            particle.update()
-
-    def draw_grid(self):
-        for x in range(0, WINDOW_WIDTH, GRID_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (x, 0), (x, WINDOW_HEIGHT))
-        for y in range(0, WINDOW_HEIGHT, GRID_SIZE):
-            pygame.draw.line(self.screen, GRID_COLOR, (0, y), (WINDOW_WIDTH, y))
-
-    def draw_ui(self):
         # Score
-        score_text = self.font_medium.render(f"Score: {self.score}", True, TEXT_COLOR)
-        self.screen.blit(score_text, (10, 10))
+        score_text = render(self.font_medium, f"Score: {self.score}", TEXT_COLOR)
+        rects.append(self.screen.blit(score_text, (10, 10)))
         
         # High Score
-        high_score_text = self.font_small.render(f"High Score: {self.high_score}", True, ACCENT_COLOR)
-        self.screen.blit(high_score_text, (10, 50))
+        high_score_text = render(self.font_small, f"High Score: {self.high_score}", ACCENT_COLOR)
+        rects.append(self.screen.blit(high_score_text, (10, 50)))
         
         # Controls
-        controls_text = self.font_small.render("Use Arrow Keys or WASD to move", True, (150, 150, 150))
-        self.screen.blit(controls_text, (10, WINDOW_HEIGHT - 30))
+        controls_text = render(self.font_small, "Use Arrow Keys or WASD to move", (150, 150, 150))
+        rects.append(self.screen.blit(controls_text, (10, WINDOW_HEIGHT - 30)))
+        
+        y = 76
+        if self.client is not None:
+            room = self.sim
+            players = f"Room {room.room_id}: {len(room.snakes)} players"
+            rects.append(self.screen.blit(render(self.font_small, players, RIVAL_COLOR), (10, y)))
+            y += 24
+        if self.autopilot_enabled:
+            label = render(self.font_small, "Autopilot (F4 or arrows to take over)", ACCENT_COLOR)
+            rects.append(self.screen.blit(label, (10, y)))
+            y += 24
+        
+        # Food is usually off screen on a large board, so point the way
+        food = self.food.position
+        if self.scrolling and food is not None:
+            hint = f"Food: {food[0] - self.snake.head_x:+d}, {food[1] - self.snake.head_y:+d}"
+            rects.append(self.screen.blit(render(self.font_small, hint, FOOD_COLOR), (10, y)))
+
+        if self.show_stats:
+            lines = (self.sprites.stats(), self.text_cache.stats(), self.input_queue.stats(),
+                     self.autopilot.stats(), f"Dirty rects: {len(self.dirty_rects)}")
+            for i, line in enumerate(lines):
+                stats_text = render(self.font_small, line, (150, 150, 150))
+                rects.append(self.screen.blit(stats_text,
+                                              (WINDOW_WIDTH - stats_text.get_width() - 10, 10 + i * 24)))
+        return rects
 
     def draw_game_over(self):
+        # The overlay only changes with the outcome and final score
+        key = (self.won, self.score)
+        if key != self.game_over_key:
+            self.game_over_overlay = self.build_game_over_overlay()
+            self.game_over_key = key
+        self.screen.blit(self.game_over_overlay, (0, 0))
+
+    def build_game_over_overlay(self) -> pygame.Surface:
         # Semi-transparent overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 128))
+        render = self.text_cache.render
         
         # Game Over text with glow
-        game_over_text = self.font_large.render("GAME OVER", True, (255, 100, 100))
-        glow_text = self.font_large.render("GAME OVER", True, (255, 200, 200))
+        title = "YOU WIN" if self.won else "GAME OVER"
+        game_over_text = render(self.font_large, title, (255, 100, 100))
+        glow_text = render(self.font_large, title, (255, 200, 200))
         
         text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
         glow_rect = glow_text.get_rect(center=(WINDOW_WIDTH // 2 + 2, WINDOW_HEIGHT // 2 - 48))
         
-        self.screen.blit(glow_text, glow_rect)
-        self.screen.blit(game_over_text, text_rect)
+        overlay.blit(glow_text, glow_rect)
+        overlay.blit(game_over_text, text_rect)
         
         # Final score
-        final_score_text = self.font_medium.render(f"Final Score: {self.score}", True, TEXT_COLOR)
+        final_score_text = render(self.font_medium, f"Final Score: {self.score}", TEXT_COLOR)
         score_rect = final_score_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-        self.screen.blit(final_score_text, score_rect)
+        overlay.blit(final_score_text, score_rect)
         
         # Instructions
-        restart_text = self.font_small.render("Press SPACE to restart or ESC to quit", True, ACCENT_COLOR)
+        restart_text = render(self.font_small, "Press SPACE to restart or ESC to quit", ACCENT_COLOR)
         restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
-        self.screen.blit(restart_text, restart_rect)
+        overlay.blit(restart_text, restart_rect)
+        return overlay
+
+    def start_game(self):
+        if self.client is not None:
+            # The server spawned us on join; later games ask it for a respawn
+            if self.games_played:
+                self.client.respawn()
+        elif self.replay is not None:
+            self.sim.reset(self.replay.seed)
+        elif self.record_path is not None:
+            self.recording = Replay.record(self.sim, self.seed + self.games_played)
+        else:
+            self.sim.reset(self.seed + self.games_played)
+        self.clear_effects()
+
+    def clear_effects(self):
+        self.trail_positions.clear()
+        self.previous_length = 0
+        self.input_queue.clear()
+        self.particles.clear()
 
     def restart_game(self):
-        self.snake = Snake()
-        self.food = Food()
-        self.score = 0
-        self.game_over = False
-        self.particles = []
-        
-        while self.food.position in self.snake.body:
-            self.food.position = self.food.generate_position()
+        self.save_recording()
+        self.games_played += 1
+        self.start_game()
+
+    def save_recording(self):
+        # The first game goes to record_path, later ones get a -2, -3... suffix
+        if self.recording is None or self.recording.ticks == 0:
+            return
+        path = self.record_path
+        if self.games_played:
+            stem, ext = os.path.splitext(path)
+            path = f"{stem}-{self.games_played + 1}{ext}"
+        self.recording.save(path)
 
-    def draw(self):
-        self.screen.fill(BACKGROUND_COLOR)
-        self.draw_grid()
+    def seek(self, tick: int):
+        self.replay.seek(self.sim, tick)
+        self.clear_effects()
+
+    def draw(self, alpha: float = 1.0):
+        profiler = self.profiler
+        screen = self.screen
+        
+        # The game over overlay darkens the whole window, so it and the frame after it
+        # are full redraws, as is any frame where the camera scrolled
+        self.update_camera(alpha)
+        full = self.full_redraw or self.game_over or self.camera != self.drawn_camera
+        offset_x = self.camera[0] % GRID_SIZE
+        offset_y = self.camera[1] % GRID_SIZE
+        if full:
+            screen.blit(self.background, (0, 0), (offset_x, offset_y, WINDOW_WIDTH, WINDOW_HEIGHT))
+            if self.camera != self.drawn_camera:
+                self.frame_rects = self.build_frame_rects()
+            for color, frame_rect in self.frame_rects:
+                screen.fill(color, frame_rect)
+        else:
+            screen.blits([(self.background, rect, rect.move(offset_x, offset_y))
+                          for rect in self.dirty_rects], False)
+            for color, frame_rect in self.frame_rects:
+                for rect in self.dirty_rects:
+                    if frame_rect.colliderect(rect):
+                        screen.fill(color, frame_rect.clip(rect))
+        self.drawn_camera = self.camera
+        profiler.mark("background")
         
         # Draw particles
-        for particle in self.particles:
-            particle.draw(self.screen)
+        rects = self.particles.draw(screen, self.camera)
+        profiler.mark("particles")
         
         # Draw game objects
-        self.food.draw(self.screen)
-        self.snake.draw(self.screen, self.particles)
+        rects += self.draw_food()
+        profiler.mark("food")
+        rects += self.draw_snake(alpha)
+        profiler.mark("snake")
         
         # Draw UI
-        self.draw_ui()
+        rects += self.draw_ui()
+        profiler.mark("ui")
         
         if self.game_over:
             self.draw_game_over()
+            profiler.mark("game_over")
+        
+        if self.show_profiler:
+            rects += profiler.draw_overlay(screen, self.font_small)
+            profiler.mark("overlay")
         
-        pygame.display.flip()
+        # Present what was drawn this frame plus what it covered last frame
+        if full or len(rects) + len(self.dirty_rects) > DIRTY_RECT_LIMIT:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects + rects)
+        self.dirty_rects = rects
+        self.full_redraw = self.game_over
+        profiler.mark("present")
 
-    def run(self):
-        running = True
+    def run(self, measure_startup: bool = False):
+        # Show the first frame before warming anything it did not need
+        self.draw(0.0)
+        self.startup_marks.append(("first frame", time.perf_counter()))
+        if measure_startup:
+            print_startup(self.startup_marks)
+        else:
+            self.sprites.warm()
+        self.clock.tick()
+        
+        running = not measure_startup
+        tick_length = 1.0 / self.tick_rate
+        accumulator = 0.0
+        profiler = self.profiler
         while running:
+            dt = min(self.clock.tick(self.frame_rate) / 1000.0, MAX_FRAME_TIME)
+            profiler.begin_frame()
+            
+            # Input is polled every frame; the simulation catches up in fixed ticks
             running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(10)  # Snake speed
+            profiler.mark("handle_events")
+            if self.client is not None:
+                # Online, ticks come from the server; interpolate from the latest one
+                try:
+                    ticks = self.client.poll()
+                except ConnectionError as error:
+                    print(f"Disconnected: {error}")
+                    break
+                for flags in ticks:
+                    self.update_remote(flags)
+                if ticks and self.autopilot_enabled:
+                    self.steer_remote()
+                accumulator = 0.0 if ticks else min(accumulator + dt, tick_length)
+            else:
+                accumulator += dt
+                while accumulator >= tick_length:
+                    self.update()
+                    accumulator -= tick_length
+            profiler.mark("update")
+            
+            self.animate(dt)
+            profiler.mark("animate")
+            self.draw(accumulator / tick_length)
+            profiler.end_frame()
         
+        if self.profile_path:
+            profiler.export(self.profile_path)
+        self.save_recording()
+        if self.client is not None:
+            self.client.close()
         pygame.quit()
         sys.exit()
 
+def print_startup(marks: List[Tuple[str, float]]):
+    """Print each cold start phase and the total time to the first presented frame"""
+    previous = IMPORT_START
+    for name, timestamp in marks:
+        print(f"   {name:<12}{(timestamp - previous) * 1000:8.1f} ms")
+        previous = timestamp
+    print(f"🐍 first frame {(previous - IMPORT_START) * 1000:.1f} ms after startup")
+
+def parse_board_size(value: str) -> Tuple[int, int]:
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{value}'")
+    if not (2 <= width <= MAX_BOARD_SIZE and 2 <= height <= MAX_BOARD_SIZE):
+        raise argparse.ArgumentTypeError(f"board sides must be between 2 and {MAX_BOARD_SIZE}")
+    return width, height
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Glamorous Snake Game")
+    parser.add_argument('--seed', type=int, default=None, help="seed for food and particles")
+    parser.add_argument('--record', metavar='PATH', help="record each game to a replay file")
+    parser.add_argument('--replay', metavar='PATH', help="play back a recorded replay")
+    parser.add_argument('--speed', type=float, default=1.0, help="simulation speed multiplier")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="profile every frame and write a Chrome trace (.json) or CSV on exit")
+    parser.add_argument('--board', type=parse_board_size, default=None, metavar='WxH',
+                        help=f"board size in cells, up to {MAX_BOARD_SIZE}x{MAX_BOARD_SIZE}; "
+                             "boards larger than the window scroll")
+    parser.add_argument('--connect', metavar='HOST[:PORT]',
+                        help="play online in a room on a multiplayer server (see server.py)")
+    parser.add_argument('--autopilot', action='store_true',
+                        help="let the autopilot play game after game (F4 toggles it)")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="print the time to the first frame by phase, then quit")
+    args = parser.parse_args(argv)
+    # Seeds feed NumPy's generator and the replay header's unsigned 64-bit field
+    if args.seed is not None and not 0 <= args.seed < 2 ** 64:
+        parser.error("--seed must be between 0 and 2**64 - 1")
+    if not (args.speed > 0 and math.isfinite(args.speed)):
+        parser.error("--speed must be a positive number")
+    if args.connect and (args.record or args.replay):
+        parser.error("--connect cannot be combined with --record or --replay")
+    if args.autopilot and args.replay:
+        parser.error("--autopilot cannot be combined with --replay")
+    return args
+
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    args = parse_args(sys.argv[1:])
+    replay = Replay.load(args.replay) if args.replay else None
+    client = None
+    if args.connect:
+        host, _, port = args.connect.partition(':')
+        client = NetClient.connect(host, int(port or DEFAULT_SERVER_PORT))
+    game = Game(tick_rate=TICK_RATE * args.speed, seed=args.seed,
+                record_path=args.record, replay=replay, profile_path=args.profile,
+                board_size=args.board, client=client, autopilot=args.autopilot)
+    game.run(measure_startup=args.startup_time)
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Client side of networked Snake
+RemoteRoom mirrors a server room from its snapshot and per-tick deltas and
+looks enough like a Simulation for the renderer; NetClient talks to the
+server over a non-blocking socket polled once per frame
+"""
+
+import socket
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import protocol
+from core import FOOD_REWARD, Direction, Snake
+
+DIRECTION_BY_DELTA = {direction.value: direction for direction in Direction}
+
+RECEIVE_SIZE = 65536
+CONNECT_TIMEOUT = 5.0
+
+class RemoteFood:
+    def __init__(self):
+        self.position: Optional[Tuple[int, int]] = None
+
+class RemoteRoom:
+    def __init__(self, snapshot: bytes):
+        self.snakes: Dict[int, Snake] = {}
+        self.alive: Dict[int, bool] = {}
+        self.scores: Dict[int, int] = {}
+        # Length before this tick's move for snakes that moved, for interpolation
+        self.previous_lengths: Dict[int, int] = {}
+        self.food = RemoteFood()
+        self.won = False
+        self.desyncs = 0
+        self.needs_sync = False
+        self.apply_snapshot(snapshot)
+
+    # The local player's view, shaped like a Simulation
+
+    @property
+    def snake(self) -> Snake:
+        return self.snakes[self.player_id]
+
+    @property
+    def score(self) -> int:
+        return self.scores[self.player_id]
+
+    @property
+    def done(self) -> bool:
+        return not self.alive[self.player_id]
+
+    def others(self) -> Iterator[Tuple[Snake, int]]:
+        """Live rival snakes with their previous lengths"""
+        for player, snake in self.snakes.items():
+            if player != self.player_id and self.alive[player]:
+                yield snake, self.previous_lengths.get(player, 0)
+
+    def cell_position(self, cell: Optional[int]) -> Optional[Tuple[int, int]]:
+        return None if cell is None else (cell % self.width, cell // self.width)
+
+    def apply_snapshot(self, body: bytes):
+        (self.ticks, self.room_id, self.width, self.height, self.player_id,
+         food, snakes) = protocol.decode_snapshot(body)
+        self.snakes.clear()
+        self.previous_lengths.clear()
+        self.needs_sync = False
+        for player, alive, grow, score, direction, cells in snakes:
+            snake = Snake(self.width, self.height)
+            head = self.cell_position(cells[0])
+            snake.restore(cells, head[0], head[1], direction, grow, False)
+            self.snakes[player] = snake
+            self.alive[player] = alive
+            self.scores[player] = score
+        self.food.position = self.cell_position(food)
+
+    def apply_tick(self, body: bytes) -> int:
+        """Apply one tick of deltas; returns the local player's flags for effects"""
+        self.ticks, entries, food_moved, food = protocol.decode_tick(body)
+        self.previous_lengths.clear()
+        own_flags = 0
+        for player, flags, cell in entries:
+            if player == self.player_id:
+                own_flags |= flags
+            if flags & protocol.LEFT:
+                self.snakes.pop(player, None)
+                self.alive.pop(player, None)
+                self.scores.pop(player, None)
+                continue
+            snake = self.snakes.get(player)
+            if flags & protocol.SPAWN:
+                if snake is None:
+                    snake = self.snakes[player] = Snake(self.width, self.height)
+                    self.scores[player] = 0
+                snake.reset(self.cell_position(cell))
+                self.alive[player] = True
+            if snake is None:
+                self.desyncs += 1
+                self.needs_sync = True
+                continue
+            if flags & protocol.HEAD:
+                # Replay the server's move: direction from the head step, growth from the tail
+                x, y = self.cell_position(cell)
+                direction = DIRECTION_BY_DELTA.get((x - snake.head_x, y - snake.head_y))
+                if direction is None:
+                    self.desyncs += 1
+                    self.needs_sync = True
+                    continue
+                self.previous_lengths[player] = snake.length
+                snake.direction = direction
+                snake.grow = not flags & protocol.TAIL
+                snake.move()
+            if flags & protocol.ATE:
+                snake.eat_food()
+                self.scores[player] += FOOD_REWARD
+            if flags & protocol.DIED:
+                self.alive[player] = False
+        if food_moved:
+            self.food.position = self.cell_position(food)
+        return own_flags
+
+class NetClient:
+    def __init__(self, sock: socket.socket, room: RemoteRoom, reader: protocol.FrameReader,
+                 pending: List[Tuple[int, bytes]]):
+        self.sock = sock
+        self.room = room
+        self.reader = reader
+        self.pending = pending  # messages that arrived along with the snapshot
+        self.outbox = bytearray()  # bytes the socket has not accepted yet
+        self.send_error: Optional[ConnectionError] = None
+        self.bytes_received = 0
+
+    @classmethod
+    def connect(cls, host: str, port: int, room: int = protocol.ANY_ROOM) -> 'NetClient':
+        """Join a room and wait for its snapshot, then switch to non-blocking polling"""
+        sock = socket.create_connection((host, port), timeout=CONNECT_TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(protocol.encode_join(room))
+        reader = protocol.FrameReader()
+        pending: List[Tuple[int, bytes]] = []
+        while not pending or pending[0][0] != protocol.SNAPSHOT:
+            data = sock.recv(RECEIVE_SIZE)
+            if not data:
+                raise ConnectionError(f"{host}:{port} closed the connection before the snapshot")
+            pending += reader.feed(data)
+        sock.setblocking(False)
+        return cls(sock, RemoteRoom(pending[0][1]), reader, pending[1:])
+
+    def poll(self) -> List[int]:
+        """Apply everything the server sent; returns the local flags of each new tick"""
+        if self.send_error is not None:
+            raise self.send_error
+        self.flush()
+        messages, self.pending = self.pending, []
+        while True:
+            try:
+                data = self.sock.recv(RECEIVE_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                raise ConnectionError("server closed the connection")
+            self.bytes_received += len(data)
+            messages += self.reader.feed(data)
+
+        ticks = []
+        for message_type, body in messages:
+            if message_type == protocol.TICK:
+                ticks.append(self.room.apply_tick(body))
+            elif message_type == protocol.SNAPSHOT:
+                self.room.apply_snapshot(body)
+        if self.room.needs_sync:
+            self.room.needs_sync = False
+            self.send(protocol.frame(protocol.SYNC))
+        return ticks
+
+    def send(self, data: bytes):
+        # Called from input handling; failures surface from the next poll()
+        self.outbox += data
+        if self.send_error is None:
+            try:
+                self.flush()
+            except ConnectionError as error:
+                self.send_error = error
+
+    def flush(self):
+        """Write as much of the outbox as the socket takes; the rest waits for the next poll"""
+        while self.outbox:
+            try:
+                sent = self.sock.send(self.outbox)
+            except BlockingIOError:
+                return
+            except OSError as error:
+                raise ConnectionError(f"send failed: {error}") from error
+            del self.outbox[:sent]
+
+    def turn(self, direction: Direction):
+        self.send(protocol.encode_turn(direction))
+
+    def respawn(self):
+        self.send(protocol.frame(protocol.RESPAWN))
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,120 @@
+"""
+Per-phase frame profiler for the Snake game
+Times each phase of a frame, keeps a rolling frame-time history for an
+on-screen overlay and exports Chrome trace or CSV files
+"""
+
+import csv
+import json
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+import pygame
+
+HISTORY_FRAMES = 240
+TRACE_FRAMES = 20000
+
+GRAPH_WIDTH = HISTORY_FRAMES
+GRAPH_HEIGHT = 80
+GRAPH_MAX_MS = 50.0
+
+class FrameProfiler:
+    def __init__(self, enabled: bool = False, budget_ms: float = 1000 / 60):
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.frame = 0
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.in_frame = False  # marks only count between begin_frame and end_frame
+        self.origin = time.perf_counter()
+
+        # Rolling history for the overlay, longer span log for export
+        self.frame_times = deque(maxlen=HISTORY_FRAMES)
+        self.phase_times: Dict[str, deque] = {}
+        self.spans = deque(maxlen=TRACE_FRAMES * 12)  # (frame, phase, start, duration)
+
+    def enable(self, enabled: bool = True):
+        """Switch profiling on or off; switched on mid-frame, it starts with the next frame"""
+        if enabled and not self.enabled:
+            self.in_frame = False
+        self.enabled = enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame += 1
+        self.frame_start = self.last_mark = time.perf_counter()
+        self.in_frame = True
+
+    def end_frame(self):
+        # Frame time is the work between begin and the last mark, without the vsync/clock wait
+        if not self.enabled or not self.in_frame:
+            return
+        self.frame_times.append((self.last_mark - self.frame_start) * 1000)
+        self.in_frame = False
+
+    def mark(self, phase: str):
+        """Attribute the time since the previous mark to phase"""
+        if not self.enabled or not self.in_frame:
+            return
+        now = time.perf_counter()
+        duration = now - self.last_mark
+        self.spans.append((self.frame, phase, self.last_mark, duration))
+        history = self.phase_times.get(phase)
+        if history is None:
+            history = self.phase_times[phase] = deque(maxlen=HISTORY_FRAMES)
+        history.append(duration * 1000)
+        self.last_mark = now
+
+    def percentiles(self) -> Tuple[float, float, float]:
+        if not self.frame_times:
+            return (0.0, 0.0, 0.0)
+        ordered = sorted(self.frame_times)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(len(ordered) * p))] for p in (0.5, 0.95, 0.99))
+
+    def phase_means(self) -> List[Tuple[str, float]]:
+        means = [(phase, sum(times) / len(times)) for phase, times in self.phase_times.items() if times]
+        return sorted(means, key=lambda item: item[1], reverse=True)
+
+    def draw_overlay(self, screen: pygame.Surface, font: pygame.font.Font) -> List[pygame.Rect]:
+        x = screen.get_width() - GRAPH_WIDTH - 10
+        y = screen.get_height() - GRAPH_HEIGHT - 10
+
+        # Frame-time graph with the frame budget as a reference line
+        panel = pygame.Surface((GRAPH_WIDTH, GRAPH_HEIGHT), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        scale = GRAPH_HEIGHT / GRAPH_MAX_MS
+        for i, ms in enumerate(self.frame_times):
+            height = min(GRAPH_HEIGHT, int(ms * scale))
+            color = (0, 255, 120) if ms <= self.budget_ms else (255, 80, 80)
+            pygame.draw.line(panel, color, (i, GRAPH_HEIGHT), (i, GRAPH_HEIGHT - height))
+        budget_y = GRAPH_HEIGHT - int(self.budget_ms * scale)
+        pygame.draw.line(panel, (255, 215, 0), (0, budget_y), (GRAPH_WIDTH, budget_y))
+        rects = [screen.blit(panel, (x, y))]
+
+        p50, p95, p99 = self.percentiles()
+        lines = [f"frame ms  p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}"]
+        lines += [f"{phase:<14}{ms:6.2f}" for phase, ms in self.phase_means()]
+        for i, line in enumerate(reversed(lines)):
+            text = font.render(line, True, (220, 220, 220))
+            rects.append(screen.blit(text, (x, y - 18 * (i + 1))))
+        return rects
+
+    def export(self, path: str):
+        """Write recorded spans as a Chrome trace (.json) or CSV (anything else)"""
+        if path.endswith('.json'):
+            events = [{
+                'name': phase, 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                'ts': (start - self.origin) * 1e6, 'dur': duration * 1e6, 'args': {'frame': frame}
+            } for frame, phase, start, duration in self.spans]
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame', 'phase', 'start_ms', 'duration_ms'])
+                for frame, phase, start, duration in self.spans:
+                    writer.writerow([frame, phase, f"{(start - self.origin) * 1000:.3f}",
+                                     f"{duration * 1000:.3f}"])
@@ -0,0 +1,143 @@
+"""
+Binary wire protocol for networked Snake
+Every message is a length-prefixed frame whose first byte is its type. The
+server sends a full snapshot when a client joins and compact per-tick deltas
+(new heads, removed tails, food moves) after that
+"""
+
+import struct
+from typing import List, Optional, Sequence, Tuple
+
+from core import Direction
+
+DIRECTIONS = list(Direction)
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+FRAME = struct.Struct('<IB')  # length of type + body, type
+
+# Client messages are a few bytes; a server drops anyone sending a larger frame
+MAX_CLIENT_FRAME_SIZE = 64
+
+# Client -> server
+JOIN = 1     # room
+TURN = 2     # direction index
+RESPAWN = 3
+SYNC = 4     # ask for a fresh snapshot
+
+# Server -> client
+SNAPSHOT = 10
+TICK = 11
+
+ANY_ROOM = 0xFFFF
+NO_FOOD = -1
+
+JOIN_BODY = struct.Struct('<H')
+TURN_BODY = struct.Struct('<B')
+SNAPSHOT_HEADER = struct.Struct('<IHHHBiB')  # tick, room, width, height, your id, food, snake count
+SNAPSHOT_SNAKE = struct.Struct('<BBBIIB')    # id, alive, grow, score, length, direction
+TICK_HEADER = struct.Struct('<IBB')          # tick, entry count, food moved
+FOOD_CELL = struct.Struct('<i')
+ENTRY = struct.Struct('<BB')                 # player id, flags
+CELL = struct.Struct('<I')
+
+# Delta entry flags; HEAD and SPAWN are followed by a cell
+HEAD = 1     # moved onto a new head cell
+TAIL = 2     # dropped its tail cell (did not grow)
+ATE = 4
+DIED = 8
+SPAWN = 16   # (re)spawned as a single segment
+LEFT = 32
+
+# A snake in a snapshot: (id, alive, grow, score, direction, cells head first)
+SnakeState = Tuple[int, bool, bool, int, Direction, Sequence[int]]
+# A delta entry: (player id, flags, cell or None)
+Entry = Tuple[int, int, Optional[int]]
+
+def frame(message_type: int, body: bytes = b'') -> bytes:
+    return FRAME.pack(len(body) + 1, message_type) + body
+
+def encode_join(room: int = ANY_ROOM) -> bytes:
+    return frame(JOIN, JOIN_BODY.pack(room))
+
+def encode_turn(direction: Direction) -> bytes:
+    return frame(TURN, TURN_BODY.pack(DIRECTION_INDEX[direction]))
+
+def encode_snapshot(tick: int, room: int, width: int, height: int, player_id: int,
+                    food: Optional[int], snakes: List[SnakeState]) -> bytes:
+    parts = [SNAPSHOT_HEADER.pack(tick, room, width, height, player_id,
+                                  NO_FOOD if food is None else food, len(snakes))]
+    for player, alive, grow, score, direction, cells in snakes:
+        parts.append(SNAPSHOT_SNAKE.pack(player, alive, grow, score, len(cells),
+                                         DIRECTION_INDEX[direction]))
+        parts.append(struct.pack(f'<{len(cells)}I', *cells))
+    return frame(SNAPSHOT, b''.join(parts))
+
+def decode_snapshot(body: bytes) -> Tuple[int, int, int, int, int, Optional[int], List[SnakeState]]:
+    tick, room, width, height, player_id, food, count = SNAPSHOT_HEADER.unpack_from(body, 0)
+    offset = SNAPSHOT_HEADER.size
+    snakes = []
+    for _ in range(count):
+        player, alive, grow, score, length, direction = SNAPSHOT_SNAKE.unpack_from(body, offset)
+        offset += SNAPSHOT_SNAKE.size
+        cells = struct.unpack_from(f'<{length}I', body, offset)
+        offset += 4 * length
+        snakes.append((player, bool(alive), bool(grow), score, DIRECTIONS[direction], cells))
+    return tick, room, width, height, player_id, None if food == NO_FOOD else food, snakes
+
+def encode_tick(tick: int, entries: List[Entry], food_moved: bool, food: Optional[int]) -> bytes:
+    parts = [TICK_HEADER.pack(tick, len(entries), food_moved)]
+    if food_moved:
+        parts.append(FOOD_CELL.pack(NO_FOOD if food is None else food))
+    for player, flags, cell in entries:
+        parts.append(ENTRY.pack(player, flags))
+        if flags & (HEAD | SPAWN):
+            parts.append(CELL.pack(cell))
+    return frame(TICK, b''.join(parts))
+
+def decode_tick(body: bytes) -> Tuple[int, List[Entry], bool, Optional[int]]:
+    tick, count, food_moved = TICK_HEADER.unpack_from(body, 0)
+    offset = TICK_HEADER.size
+    food = None
+    if food_moved:
+        (food,) = FOOD_CELL.unpack_from(body, offset)
+        offset += FOOD_CELL.size
+        if food == NO_FOOD:
+            food = None
+    entries = []
+    for _ in range(count):
+        player, flags = ENTRY.unpack_from(body, offset)
+        offset += ENTRY.size
+        cell = None
+        if flags & (HEAD | SPAWN):
+            (cell,) = CELL.unpack_from(body, offset)
+            offset += CELL.size
+        entries.append((player, flags, cell))
+    return tick, entries, bool(food_moved), food
+
+class FrameReader:
+    """Splits a byte stream into (type, body) messages
+
+    Frames longer than max_size (type + body) raise ValueError as soon as their
+    header arrives, so a bogus length never makes the reader buffer the stream.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.buffer = bytearray()
+        self.max_size = max_size
+
+    def feed(self, data: bytes) -> List[Tuple[int, bytes]]:
+        buffer = self.buffer
+        buffer += data
+        messages = []
+        offset = 0
+        while len(buffer) - offset >= FRAME.size:
+            length, message_type = FRAME.unpack_from(buffer, offset)
+            if length < 1 or (self.max_size is not None and length > self.max_size):
+                raise ValueError(f"bad frame length {length}")
+            end = offset + 4 + length
+            if end > len(buffer):
+                break
+            messages.append((message_type, bytes(buffer[offset + FRAME.size:end])))
+            offset = end
+        del buffer[:offset]
+        return messages
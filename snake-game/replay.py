@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Deterministic Snake replays
+A recording is the game seed plus the snake's direction after every tick,
+packed 2 bits per tick, with state snapshots every K ticks for fast seeking.
+A snapshot holds the body, food and RNG state, zlib compressed; the free-cell
+index is rebuilt from the body, so its size follows the snake, not the board
+"""
+
+import argparse
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import List, Tuple
+
+from core import Direction, Simulation, Snapshot
+
+DIRECTIONS = list(Direction)
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+SNAPSHOT_INTERVAL = 300
+
+# File layout: header, packed directions, then length-prefixed compressed snapshots
+MAGIC = b'SNKR'
+VERSION = 2
+HEADER = struct.Struct('<4sBQHHII')  # magic, version, seed, width, height, interval, ticks
+SNAPSHOT = struct.Struct('<IIBBBBBiiiiI')  # ticks, score, flags..., head, food, body length
+RNG_STATE = struct.Struct('<iI')  # random.Random state version, number of state words
+
+def _encode_snapshot(snapshot: Snapshot) -> bytes:
+    food = snapshot.food if snapshot.food is not None else (-1, -1)
+    rng_version, rng_words, _ = snapshot.rng_state
+    data = zlib.compress(b''.join((
+        SNAPSHOT.pack(snapshot.ticks, snapshot.score, snapshot.done, snapshot.won,
+                      DIRECTION_INDEX[snapshot.direction], snapshot.grow, snapshot.collided,
+                      snapshot.head_x, snapshot.head_y, food[0], food[1], len(snapshot.body)),
+        array('i', snapshot.body).tobytes(),
+        RNG_STATE.pack(rng_version, len(rng_words)),
+        array('I', rng_words).tobytes(),
+    )))
+    return struct.pack('<I', len(data)) + data
+
+def _decode_snapshot(data: memoryview, offset: int) -> Tuple[Snapshot, int]:
+    (size,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    record = memoryview(zlib.decompress(data[offset:offset + size]))
+    (ticks, score, done, won, direction, grow, collided,
+     head_x, head_y, food_x, food_y, body_length) = SNAPSHOT.unpack_from(record, 0)
+    position = SNAPSHOT.size
+    body = array('i')
+    body.frombytes(record[position:position + 4 * body_length])
+    position += 4 * body_length
+    rng_version, word_count = RNG_STATE.unpack_from(record, position)
+    position += RNG_STATE.size
+    rng_words = array('I')
+    rng_words.frombytes(record[position:position + 4 * word_count])
+    snapshot = Snapshot(ticks, score, bool(done), bool(won), DIRECTIONS[direction],
+                        bool(grow), bool(collided), head_x, head_y, body,
+                        None if food_x < 0 else (food_x, food_y),
+                        (rng_version, tuple(rng_words), None))
+    return snapshot, offset + size
+
+class Replay:
+    def __init__(self, seed: int, width: int, height: int,
+                 snapshot_interval: int = SNAPSHOT_INTERVAL):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.snapshot_interval = snapshot_interval
+        self.ticks = 0
+        self.moves = bytearray()
+        self.snapshots: List[Snapshot] = []
+
+    # Recording
+
+    @classmethod
+    def record(cls, sim: Simulation, seed: int,
+               snapshot_interval: int = SNAPSHOT_INTERVAL) -> 'Replay':
+        """Reset sim with seed and start a recording of it"""
+        sim.reset(seed)
+        replay = cls(seed, sim.width, sim.height, snapshot_interval)
+        replay.snapshots.append(sim.snapshot())
+        return replay
+
+    def add_tick(self, sim: Simulation):
+        """Append the tick sim just played"""
+        tick = self.ticks
+        if tick % 4 == 0:
+            self.moves.append(0)
+        self.moves[tick >> 2] |= DIRECTION_INDEX[sim.snake.direction] << ((tick & 3) * 2)
+        self.ticks += 1
+        if self.ticks % self.snapshot_interval == 0:
+            self.snapshots.append(sim.snapshot())
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.width, self.height,
+                                self.snapshot_interval, self.ticks))
+            f.write(self.moves)
+            f.write(struct.pack('<I', len(self.snapshots)))
+            for snapshot in self.snapshots:
+                f.write(_encode_snapshot(snapshot))
+
+    # Playback
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as f:
+            data = memoryview(f.read())
+        magic, version, seed, width, height, interval, ticks = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} snake replay")
+        replay = cls(seed, width, height, interval)
+        replay.ticks = ticks
+        offset = HEADER.size
+        move_bytes = (ticks + 3) // 4
+        replay.moves = bytearray(data[offset:offset + move_bytes])
+        offset += move_bytes
+        (snapshot_count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        for _ in range(snapshot_count):
+            snapshot, offset = _decode_snapshot(data, offset)
+            replay.snapshots.append(snapshot)
+        return replay
+
+    def direction_at(self, tick: int) -> Direction:
+        """Direction the snake moved in on tick number tick + 1"""
+        return DIRECTIONS[(self.moves[tick >> 2] >> ((tick & 3) * 2)) & 3]
+
+    def new_simulation(self) -> Simulation:
+        sim = Simulation(self.width, self.height)
+        sim.reset(self.seed)
+        return sim
+
+    def step(self, sim: Simulation) -> bool:
+        """Play the next recorded tick on sim; False once the recording is over"""
+        if sim.ticks >= self.ticks or sim.done:
+            return False
+        sim.step(self.direction_at(sim.ticks))
+        return True
+
+    def seek(self, sim: Simulation, tick: int):
+        """Put sim in the state after tick ticks, replaying at most K ticks"""
+        tick = max(0, min(tick, self.ticks))
+        index = min(tick // self.snapshot_interval, len(self.snapshots) - 1)
+        sim.restore(self.snapshots[index])
+        while sim.ticks < tick and self.step(sim):
+            pass
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Play back a Snake replay headlessly at full speed")
+    parser.add_argument('replay', help="replay file recorded with main.py --record")
+    parser.add_argument('--seek', type=int, default=None, help="stop at this tick instead of the end")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.replay)
+    sim = replay.new_simulation()
+    start = time.perf_counter()
+    if args.seek is not None:
+        replay.seek(sim, args.seek)
+    else:
+        while replay.step(sim):
+            pass
+    elapsed = time.perf_counter() - start
+
+    outcome = "won" if sim.won else "crashed" if sim.done else "in progress"
+    print(f"🐍 seed {replay.seed}  {replay.width}x{replay.height}  {replay.ticks} ticks recorded")
+    print(f"   tick {sim.ticks}: score {sim.score}, length {sim.snake.length}, {outcome}")
+    print(f"   {elapsed * 1000:.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Authoritative multiplayer Snake server
+Runs many rooms of up to ROOM_CAPACITY snakes in one asyncio process. One
+scheduler ticks every room, then flushes each client's messages for the tick
+in a single socket write
+"""
+
+import argparse
+import asyncio
+import random
+import socket
+import struct
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+import protocol
+from core import BOARD_HEIGHT, BOARD_WIDTH, FOOD_REWARD, OPPOSITE_DIRECTIONS, Direction, Snake
+
+DEFAULT_PORT = 7777
+TICK_RATE = 10
+ROOM_CAPACITY = 4
+TURN_QUEUE_SIZE = 3
+SPAWN_ATTEMPTS = 100
+SPAWN_CLEARANCE = 3  # free cells ahead of a new snake
+MAX_WRITE_BUFFER = 256 * 1024  # clients further behind than this are dropped
+STATS_TICKS = 6000
+
+class Player:
+    def __init__(self, player_id: int, connection: 'Connection', width: int, height: int):
+        self.id = player_id
+        self.connection = connection
+        self.snake = Snake(width, height)
+        self.alive = False
+        self.score = 0
+        self.turns = deque()
+        self.flags = 0
+
+    def queue_turn(self, direction: Direction):
+        # Validated against the last queued turn, like the local input queue
+        last = self.turns[-1] if self.turns else self.snake.direction
+        if direction in (last, OPPOSITE_DIRECTIONS[last]) or len(self.turns) >= TURN_QUEUE_SIZE:
+            return
+        self.turns.append(direction)
+
+class Room:
+    def __init__(self, room_id: int, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT,
+                 seed: Optional[int] = None):
+        self.id = room_id
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.players: Dict[int, Player] = {}
+        self.tick = 0
+        self.food: Optional[int] = None
+        # Joins, respawns and leaves since the last tick, sent ahead of its moves
+        self.events: List[protocol.Entry] = []
+        self.food = self.free_cell()
+
+    def is_free(self, cell: int) -> bool:
+        if cell == self.food:
+            return False
+        return not any(p.alive and p.snake.occupied[cell] for p in self.players.values())
+
+    def free_cell(self) -> Optional[int]:
+        capacity = self.width * self.height
+        for _ in range(SPAWN_ATTEMPTS):
+            cell = self.rng.randrange(capacity)
+            if self.is_free(cell):
+                return cell
+        # Crowded board: fall back to a scan
+        free = [cell for cell in range(capacity) if self.is_free(cell)]
+        return self.rng.choice(free) if free else None
+
+    def spawn(self, player: Player) -> bool:
+        # A random free cell with room to move, heading away from the nearest side wall
+        for _ in range(SPAWN_ATTEMPTS):
+            cell = self.free_cell()
+            if cell is None:
+                return False
+            x, y = cell % self.width, cell // self.width
+            direction = Direction.RIGHT if x < self.width // 2 else Direction.LEFT
+            dx = direction.value[0]
+            ahead = [(x + dx * i, y) for i in range(1, SPAWN_CLEARANCE + 1)]
+            if all(0 <= ax < self.width and self.is_free(y * self.width + ax) for ax, _ in ahead):
+                player.snake.reset((x, y))
+                player.snake.direction = direction
+                player.turns.clear()
+                player.alive = True
+                self.events.append((player.id, protocol.SPAWN, cell))
+                return True
+        return False
+
+    def join(self, connection: 'Connection') -> Optional[Player]:
+        if len(self.players) >= ROOM_CAPACITY:
+            return None
+        player_id = next(i for i in range(ROOM_CAPACITY) if i not in self.players)
+        player = Player(player_id, connection, self.width, self.height)
+        self.players[player_id] = player
+        self.spawn(player)
+        return player
+
+    def leave(self, player: Player):
+        del self.players[player.id]
+        self.events.append((player.id, protocol.LEFT, None))
+
+    def snapshot(self, player: Player) -> bytes:
+        snakes = [(p.id, p.alive, p.snake.grow, p.score, p.snake.direction, p.snake.body_cells())
+                  for p in self.players.values()]
+        return protocol.encode_snapshot(self.tick, self.id, self.width, self.height,
+                                        player.id, self.food, snakes)
+
+    def step(self) -> bytes:
+        """Advance one tick and return its delta frame"""
+        movers = [p for p in self.players.values() if p.alive]
+        for player in movers:
+            snake = player.snake
+            if player.turns:
+                snake.change_direction(player.turns.popleft())
+            head_slot, length = snake.head_slot, snake.length
+            snake.move()
+            player.flags = 0
+            if snake.head_slot != head_slot:
+                player.flags = protocol.HEAD if snake.length > length else protocol.HEAD | protocol.TAIL
+
+        # All snakes move before anyone checks for rivals, so tails that just left are free
+        width = self.width
+        for player in movers:
+            snake = player.snake
+            if snake.collided:
+                continue
+            cell = snake.head_y * width + snake.head_x
+            if any(other is not player and other.snake.occupied[cell] for other in movers):
+                snake.collided = True
+
+        food_moved = False
+        for player in movers:
+            snake = player.snake
+            if snake.collided:
+                player.alive = False
+                player.flags |= protocol.DIED
+            elif snake.head_y * width + snake.head_x == self.food:
+                snake.eat_food()
+                player.score += FOOD_REWARD
+                player.flags |= protocol.ATE
+                self.food = None
+        if self.food is None:
+            # Also retries a board that was too crowded last tick
+            self.food = self.free_cell()
+            food_moved = True
+
+        entries = self.events
+        self.events = []
+        for player in movers:
+            entries.append((player.id, player.flags,
+                            player.snake.cells[player.snake.head_slot]))
+        self.tick += 1
+        return protocol.encode_tick(self.tick, entries, food_moved, self.food)
+
+class Connection:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.room: Optional[Room] = None
+        self.player: Optional[Player] = None
+        self.outbox: List[bytes] = []
+        self.closed = False
+
+class Server:
+    def __init__(self, tick_rate: float = TICK_RATE, width: int = BOARD_WIDTH,
+                 height: int = BOARD_HEIGHT, seed: Optional[int] = None):
+        self.tick_rate = tick_rate
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.rooms: Dict[int, Room] = {}
+        self.connections: Set[Connection] = set()
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.dropped = 0
+
+        # Per tick: how late the scheduler woke up, and how long the tick took
+        self.lateness = deque(maxlen=STATS_TICKS)
+        self.busy = deque(maxlen=STATS_TICKS)
+        self.overruns = 0
+
+    @property
+    def players(self) -> int:
+        return sum(len(room.players) for room in self.rooms.values())
+
+    def reset_stats(self):
+        self.lateness.clear()
+        self.busy.clear()
+        self.overruns = 0
+        self.bytes_sent = 0
+        self.ticks = 0
+
+    def find_room(self, room_id: int) -> Room:
+        if room_id == protocol.ANY_ROOM:
+            for room in self.rooms.values():
+                if len(room.players) < ROOM_CAPACITY:
+                    return room
+            room_id = next(i for i in range(protocol.ANY_ROOM) if i not in self.rooms)
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = self.rooms[room_id] = Room(room_id, self.width, self.height,
+                                              self.rng.randrange(2 ** 32))
+        return room
+
+    # Connections
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = Connection(writer)
+        self.connections.add(connection)
+        frames = protocol.FrameReader(protocol.MAX_CLIENT_FRAME_SIZE)
+        try:
+            while not connection.closed:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                for message_type, body in frames.feed(data):
+                    self.handle_message(connection, message_type, body)
+        except (ConnectionError, struct.error, ValueError):
+            # Malformed, truncated or oversized messages drop only the client that sent them
+            pass
+        finally:
+            self.disconnect(connection)
+
+    def handle_message(self, connection: Connection, message_type: int, body: bytes):
+        player = connection.player
+        if message_type == protocol.JOIN and player is None:
+            (room_id,) = protocol.JOIN_BODY.unpack(body)
+            room = self.find_room(room_id)
+            player = room.join(connection)
+            if player is None:
+                room = self.find_room(protocol.ANY_ROOM)
+                player = room.join(connection)
+            connection.room, connection.player = room, player
+            connection.outbox.append(room.snapshot(player))
+        elif player is None:
+            return
+        elif message_type == protocol.TURN:
+            (index,) = protocol.TURN_BODY.unpack(body)
+            if index < len(protocol.DIRECTIONS):
+                player.queue_turn(protocol.DIRECTIONS[index])
+        elif message_type == protocol.RESPAWN and not player.alive:
+            connection.room.spawn(player)
+        elif message_type == protocol.SYNC:
+            connection.outbox.append(connection.room.snapshot(player))
+
+    def disconnect(self, connection: Connection):
+        if connection in self.connections:
+            self.connections.remove(connection)
+            connection.closed = True
+            connection.writer.close()
+            room = connection.room
+            if room is not None:
+                room.leave(connection.player)
+                if not room.players:
+                    del self.rooms[room.id]
+
+    # Ticking
+
+    def tick(self):
+        # Each room's delta is encoded once and shared by everyone in it
+        for room in self.rooms.values():
+            delta = room.step()
+            for player in room.players.values():
+                player.connection.outbox.append(delta)
+
+        # One write per client per tick
+        for connection in list(self.connections):
+            if not connection.outbox:
+                continue
+            data = b''.join(connection.outbox)
+            connection.outbox.clear()
+            transport = connection.writer.transport
+            if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                self.dropped += 1
+                self.disconnect(connection)
+                continue
+            connection.writer.write(data)
+            self.bytes_sent += len(data)
+        self.ticks += 1
+
+    async def run_ticks(self):
+        """Shared scheduler for every room, on a fixed grid of tick deadlines"""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            start = loop.time()
+            self.lateness.append(start - deadline)
+            self.tick()
+            end = loop.time()
+            self.busy.append(end - start)
+            if end - deadline > interval:
+                # A whole tick behind: skip ahead rather than bursting to catch up
+                self.overruns += 1
+                deadline = end
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self.handle_client, host, port)
+        self.scheduler = asyncio.ensure_future(self.run_ticks())
+        return server
+
+    def stats(self) -> Dict[str, float]:
+        def percentile(values, p):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000 if ordered else 0.0
+        busy = list(self.busy)
+        return {
+            'rooms': len(self.rooms),
+            'players': self.players,
+            'ticks': self.ticks,
+            'busy_mean_ms': sum(busy) / len(busy) * 1000 if busy else 0.0,
+            'busy_p99_ms': percentile(busy, 0.99),
+            'jitter_p50_ms': percentile(self.lateness, 0.5),
+            'jitter_p99_ms': percentile(self.lateness, 0.99),
+            'jitter_max_ms': max(self.lateness) * 1000 if self.lateness else 0.0,
+            'overruns': self.overruns,
+            'bytes_sent': self.bytes_sent,
+            'dropped': self.dropped,
+        }
+
+async def serve(args: argparse.Namespace):
+    server = Server(args.tick_rate, args.width, args.height, args.seed)
+    listener = await server.start(args.host, args.port)
+    port = listener.sockets[0].getsockname()[1]
+    print(f"🐍 serving on {args.host}:{port} at {args.tick_rate:g} ticks/s")
+    while True:
+        await asyncio.sleep(args.stats_interval)
+        stats = server.stats()
+        print(f"   {time.strftime('%H:%M:%S')}  rooms {stats['rooms']}  players {stats['players']}  "
+              f"tick {stats['busy_mean_ms']:.2f} ms  jitter p99 {stats['jitter_p99_ms']:.2f} ms")
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run an authoritative multiplayer Snake server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--tick-rate', type=float, default=TICK_RATE, help="room ticks per second")
+    parser.add_argument('--width', type=int, default=BOARD_WIDTH)
+    parser.add_argument('--height', type=int, default=BOARD_HEIGHT)
+    parser.add_argument('--seed', type=int, default=None, help="seed for room food and spawns")
+    parser.add_argument('--stats-interval', type=float, default=10.0, help="seconds between stats lines")
+    return parser.parse_args(argv)
+
+def main(argv: List[str]) -> int:
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
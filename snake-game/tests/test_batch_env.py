@@ -0,0 +1,68 @@
+import numpy as np
+
+from batch_env import NO_ACTION, BatchSimulation
+from core import FOOD_REWARD
+
+def check_invariants(batch: BatchSimulation):
+    assert (batch.occupied.sum(axis=1) == batch.length).all()
+    has_food = batch.food >= 0
+    assert not batch.occupied[batch.games[has_food], batch.food[has_food]].any()
+    heads = batch.body[batch.games, batch.head_slot]
+    assert (heads == batch.head_y * batch.width + batch.head_x).all()
+
+def play(batch: BatchSimulation, ticks: int, seed: int):
+    rng = np.random.default_rng(seed)
+    history = []
+    for _ in range(ticks):
+        actions = rng.integers(-1, 4, batch.num_games)
+        state, rewards, dones = batch.step(actions)
+        check_invariants(batch)
+        history.append((state.head_x.copy(), state.length.copy(), state.food.copy(),
+                        rewards.copy(), dones.copy()))
+    return history
+
+def test_invariants_hold_over_random_play():
+    batch = BatchSimulation(64, 10, 8, seed=3)
+    play(batch, 300, seed=0)
+    assert batch.episodes.sum() > 0
+
+def test_results_do_not_depend_on_batch_size():
+    small, large = BatchSimulation(3, 12, 10, seed=11), BatchSimulation(50, 12, 10, seed=11)
+    rng = np.random.default_rng(4)
+    for _ in range(300):
+        actions = rng.integers(-1, 4, 50)
+        small_state, small_rewards, small_dones = small.step(actions[:3])
+        large_state, large_rewards, large_dones = large.step(actions)
+        for a, b in zip(small_state, large_state):
+            assert (a == b[:3]).all()
+        assert (small_rewards == large_rewards[:3]).all()
+        assert (small_dones == large_dones[:3]).all()
+
+def test_wall_ends_and_resets_the_game():
+    batch = BatchSimulation(4, 10, 8, seed=0)
+    batch.food[:] = 0  # out of the way
+    for _ in range(4):
+        _, _, dones = batch.step()
+        assert not dones.any()
+    state, rewards, dones = batch.step(np.full(4, NO_ACTION))
+    assert dones.all() and (rewards == 0).all()
+    assert (state.length == 1).all() and (state.ticks == 0).all() and (batch.episodes == 1).all()
+    check_invariants(batch)
+
+def test_eating_scores_and_grows_next_tick():
+    batch = BatchSimulation(2, 10, 8, seed=0)
+    batch.food[:] = [4 * 10 + 6, 0]  # in front of game 0 only
+    state, rewards, dones = batch.step()
+    assert list(rewards) == [FOOD_REWARD, 0] and not dones.any()
+    assert list(state.length) == [1, 1]
+    state, _, _ = batch.step()
+    assert list(state.length) == [2, 1]
+    check_invariants(batch)
+
+def test_grids_mark_body_head_and_food():
+    batch = BatchSimulation(1, 10, 8, seed=0)
+    grid = batch.grids()[0]
+    assert grid[4, 5] == 2
+    food = batch.food[0]
+    assert grid[food // 10, food % 10] == 3
+    assert (grid > 0).sum() == 2
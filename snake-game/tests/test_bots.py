@@ -0,0 +1,30 @@
+from bots import STALL_SLACK, AutopilotPolicy
+from core import Direction, Simulation, Snake
+
+def play(policy, sim: Simulation, max_ticks: int) -> int:
+    """Longest run of ticks without eating before the game ends or max_ticks pass"""
+    hungry = longest = 0
+    while not sim.done and sim.ticks < max_ticks:
+        _, reward, _ = sim.step(policy(sim))
+        hungry = 0 if reward else hungry + 1
+        longest = max(longest, hungry)
+    return longest
+
+def test_autopilot_never_circles_the_food_forever():
+    # These seeds used to loop for good around food the room check never let it take
+    for width, height, seed in ((12, 10, 1), (20, 15, 29), (8, 8, 25)):
+        sim = Simulation(width, height, seed=seed)
+        longest = play(AutopilotPolicy(seed), sim, 20000)
+        assert sim.done
+        assert longest < 2 * width * height + STALL_SLACK
+
+def test_autopilot_plans_past_a_row_edge():
+    # Heading right at x=0, the cell before the head in memory is the end of the row above,
+    # which is not behind the snake and must stay reachable
+    snake = Snake(12, 10)
+    snake.reset((0, 5))
+    snake.direction = Direction.RIGHT
+    food = 4 * 12 + 11
+    policy = AutopilotPolicy(0)
+    assert policy.decide(snake, food) is not None
+    assert policy.path and policy.path[-1] == food
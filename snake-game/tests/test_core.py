@@ -0,0 +1,167 @@
+import random
+
+from core import FOOD_REWARD, Direction, FreeCellIndex, Simulation
+
+def check_invariants(sim: Simulation):
+    snake = sim.snake
+    body = snake.body_cells()
+    assert len(body) == snake.length == len(set(body))
+    assert sum(snake.occupied) == snake.length
+    assert len(snake.free_cells) == snake.capacity - snake.length
+    for cell in range(snake.capacity):
+        assert (cell in snake.free_cells) != bool(snake.occupied[cell])
+    if sim.food.position is not None:
+        x, y = sim.food.position
+        assert not snake.is_occupied(x, y)
+
+def test_step_moves_head_one_cell():
+    sim = Simulation(10, 8, seed=1)
+    sim.food.position = (0, 0)
+    state, reward, done = sim.step(Direction.UP)
+    assert state.head == (5, 3)
+    assert (reward, done, state.ticks) == (0, False, 1)
+
+def test_reversal_is_ignored():
+    sim = Simulation(10, 8, seed=1)
+    sim.food.position = (0, 0)
+    state, _, _ = sim.step(Direction.LEFT)
+    assert state.direction == Direction.RIGHT
+    assert state.head == (6, 4)
+
+def test_eating_scores_and_grows_next_tick():
+    sim = Simulation(10, 8, seed=1)
+    sim.food.position = (6, 4)
+    state, reward, done = sim.step()
+    assert (reward, state.score, state.length, done) == (FOOD_REWARD, FOOD_REWARD, 1, False)
+    assert state.food != (6, 4)
+    state, _, _ = sim.step()
+    assert state.length == 2
+    check_invariants(sim)
+
+def test_wall_ends_the_game():
+    sim = Simulation(10, 8, seed=1)
+    sim.food.position = (0, 0)
+    for _ in range(4):
+        assert not sim.step()[2]
+    state, reward, done = sim.step()
+    assert done and not sim.won and reward == 0
+    assert sim.step(Direction.UP) == (state, 0, True)
+
+def test_running_into_the_body_ends_the_game():
+    sim = Simulation(10, 8, seed=1)
+    for x in range(6, 10):
+        sim.food.position = (x, 4)
+        sim.step()
+    sim.food.position = (0, 0)
+    # Length 5 along row 4; a tight U-turn lands on the body, not the tail
+    for direction in (Direction.UP, Direction.LEFT):
+        assert not sim.step(direction)[2]
+    _, _, done = sim.step(Direction.DOWN)
+    assert done and sim.snake.collided and not sim.won
+
+def test_following_the_tail_is_allowed():
+    # 2x2 board walked as a cycle: the head keeps moving into the cell the tail just left
+    cycle = {(1, 1): Direction.UP, (1, 0): Direction.LEFT, (0, 0): Direction.DOWN, (0, 1): Direction.RIGHT}
+    sim = Simulation(2, 2, seed=3)
+    for _ in range(100):
+        if sim.done:
+            break
+        sim.step(cycle[sim.snake.head])
+        check_invariants(sim)
+    assert sim.won and sim.snake.length == 4 and sim.food.position is None
+
+def test_invariants_hold_over_random_play():
+    rng = random.Random(0)
+    directions = list(Direction)
+    for seed in range(20):
+        sim = Simulation(8, 6, seed=seed)
+        while not sim.done:
+            sim.step(rng.choice(directions))
+            check_invariants(sim)
+
+def test_same_seed_same_game():
+    actions = [random.Random(5).choice(list(Direction)) for _ in range(200)]
+    runs = []
+    for _ in range(2):
+        sim = Simulation(12, 10, seed=42)
+        runs.append([sim.step(action) for action in actions])
+    assert runs[0] == runs[1]
+
+def test_snapshot_restore_replays_identically():
+    rng = random.Random(1)
+    sim = Simulation(12, 10, seed=7)
+    for _ in range(30):
+        sim.step(rng.choice([None, Direction.UP, Direction.LEFT]))
+    snapshot = sim.snapshot()
+    actions = [rng.choice(list(Direction) + [None]) for _ in range(100)]
+    first = [sim.step(action) for action in actions]
+    sim.restore(snapshot)
+    assert [sim.step(action) for action in actions] == first
+
+def test_restore_moves_the_board_between_snapshots():
+    rng = random.Random(3)
+    sim = Simulation(12, 10, seed=11)
+    early = late = sim.snapshot()
+    for _ in range(300):
+        _, _, done = sim.step(rng.choice(list(Direction)))
+        if done:
+            break
+        late = sim.snapshot()
+    assert list(late.body) != list(early.body)
+    sim.restore(early)
+    check_invariants(sim)
+    sim.restore(late)
+    check_invariants(sim)
+    sim.restore(early)
+    check_invariants(sim)
+
+def test_free_cell_index_add_remove():
+    index = FreeCellIndex(10)
+    for cell in (3, 7, 0):
+        index.remove(cell)
+    assert len(index) == 7
+    assert 3 not in index and 7 not in index and 0 not in index
+    assert all(cell in index for cell in (1, 2, 4, 5, 6, 8, 9))
+    index.add(7)
+    assert 7 in index and len(index) == 8
+
+def test_free_cell_index_samples_only_free_cells():
+    index = FreeCellIndex(20)
+    taken = set(range(0, 20, 3))
+    for cell in taken:
+        index.remove(cell)
+    rng = random.Random(0)
+    assert {index.sample(rng) for _ in range(500)} == set(range(20)) - taken
+    for cell in set(range(20)) - taken:
+        index.remove(cell)
+    assert index.sample(rng) is None
+
+def test_free_cell_index_sampling_depends_only_on_the_free_set():
+    # Restores rebuild the index from the body alone, so history must not matter
+    first, second = FreeCellIndex(5000), FreeCellIndex(5000)
+    taken = random.Random(2).sample(range(5000), 3000)
+    for cell in taken:
+        first.remove(cell)
+    for cell in range(5000):
+        second.remove(cell)
+    for cell in set(range(5000)) - set(taken):
+        second.add(cell)
+    a, b = random.Random(9), random.Random(9)
+    assert [first.sample(a) for _ in range(200)] == [second.sample(b) for _ in range(200)]
+
+def test_free_cell_index_finds_the_rth_free_cell_across_groups():
+    class FixedRank:
+        def __init__(self, rank: int):
+            self.rank = rank
+
+        def randrange(self, stop: int) -> int:
+            return self.rank
+
+    index = FreeCellIndex(20001)
+    taken = set(random.Random(4).sample(range(20001), 12000))
+    for cell in taken:
+        index.remove(cell)
+    free = sorted(set(range(20001)) - taken)
+    for rank in range(0, len(free), 97):
+        assert index.sample(FixedRank(rank)) == free[rank]
+    assert index.sample(FixedRank(len(free) - 1)) == free[-1]
@@ -0,0 +1,29 @@
+import time
+
+from profiler import FrameProfiler
+
+def test_enabling_mid_frame_waits_for_the_next_frame():
+    profiler = FrameProfiler()
+    profiler.begin_frame()  # skipped while disabled
+    profiler.enable()
+    profiler.mark("handle_events")
+    profiler.end_frame()
+    assert not profiler.frame_times and not profiler.phase_times
+
+    profiler.begin_frame()
+    profiler.mark("update")
+    profiler.end_frame()
+    assert len(profiler.frame_times) == 1 and profiler.frame_times[0] < 100
+    assert list(profiler.phase_times) == ["update"]
+
+def test_toggling_off_and_on_records_no_stale_frame():
+    profiler = FrameProfiler(enabled=True)
+    profiler.begin_frame()
+    profiler.mark("update")
+    profiler.enable(False)
+    time.sleep(0.2)
+    profiler.enable()
+    profiler.mark("present")
+    profiler.end_frame()
+    assert not profiler.frame_times
+    assert list(profiler.phase_times) == ["update"]
@@ -0,0 +1,53 @@
+import pytest
+
+import protocol
+from core import Direction
+
+def split(data: bytes):
+    """Run encoded frames through a FrameReader one byte at a time"""
+    reader = protocol.FrameReader()
+    messages = []
+    for i in range(len(data)):
+        messages += reader.feed(data[i:i + 1])
+    assert not reader.buffer
+    return messages
+
+def test_join_and_turn_round_trip():
+    messages = split(protocol.encode_join(7) + protocol.encode_join()
+                     + b''.join(protocol.encode_turn(d) for d in Direction))
+    assert [t for t, _ in messages] == [protocol.JOIN] * 2 + [protocol.TURN] * 4
+    assert protocol.JOIN_BODY.unpack(messages[0][1]) == (7,)
+    assert protocol.JOIN_BODY.unpack(messages[1][1]) == (protocol.ANY_ROOM,)
+    turns = [protocol.DIRECTIONS[protocol.TURN_BODY.unpack(body)[0]] for _, body in messages[2:]]
+    assert turns == list(Direction)
+
+def test_snapshot_round_trip():
+    snakes = [(0, True, False, 30, Direction.UP, (105, 155, 205)),
+              (3, False, True, 0, Direction.LEFT, ())]
+    for food in (1234, None):
+        [(message_type, body)] = split(protocol.encode_snapshot(99, 2, 50, 35, 3, food, snakes))
+        assert message_type == protocol.SNAPSHOT
+        assert protocol.decode_snapshot(body) == (99, 2, 50, 35, 3, food, snakes)
+
+def test_tick_round_trip():
+    entries = [(0, protocol.HEAD | protocol.TAIL, 77), (1, protocol.HEAD | protocol.ATE, 0),
+               (2, protocol.DIED, None), (3, protocol.SPAWN, 1749), (4, protocol.LEFT, None)]
+    for food_moved, food in ((False, None), (True, 321), (True, None)):
+        [(message_type, body)] = split(protocol.encode_tick(12, entries, food_moved, food))
+        assert message_type == protocol.TICK
+        assert protocol.decode_tick(body) == (12, entries, food_moved, food)
+
+def test_frame_reader_keeps_partial_frames():
+    data = protocol.encode_turn(Direction.DOWN) + protocol.frame(protocol.RESPAWN)
+    reader = protocol.FrameReader()
+    assert reader.feed(data[:-1]) == [(protocol.TURN, data[5:6])]
+    assert reader.feed(data[-1:]) == [(protocol.RESPAWN, b'')]
+
+def test_frame_reader_rejects_bad_lengths():
+    reader = protocol.FrameReader(protocol.MAX_CLIENT_FRAME_SIZE)
+    with pytest.raises(ValueError):
+        reader.feed(protocol.FRAME.pack(2 ** 32 - 1, protocol.JOIN))
+    with pytest.raises(ValueError):
+        protocol.FrameReader().feed(protocol.FRAME.pack(0, protocol.TURN) + b'\x00' * 8)
+    reader = protocol.FrameReader(protocol.MAX_CLIENT_FRAME_SIZE)
+    assert reader.feed(protocol.encode_join(3)) == [(protocol.JOIN, protocol.JOIN_BODY.pack(3))]
@@ -0,0 +1,48 @@
+import asyncio
+
+import protocol
+from server import Server
+
+async def read_message(reader: asyncio.StreamReader):
+    frames = protocol.FrameReader()
+    while True:
+        data = await asyncio.wait_for(reader.read(4096), 5)
+        if not data:
+            return None
+        messages = frames.feed(data)
+        if messages:
+            return messages[0]
+
+async def serve_bad_and_good_clients(bad_message: bytes):
+    server = Server(tick_rate=50, seed=0)
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        good_reader, good_writer = await asyncio.open_connection('127.0.0.1', port)
+        good_writer.write(protocol.encode_join(1))
+        assert (await read_message(good_reader))[0] == protocol.SNAPSHOT
+
+        bad_reader, bad_writer = await asyncio.open_connection('127.0.0.1', port)
+        bad_writer.write(protocol.encode_join(1))
+        assert (await read_message(bad_reader))[0] == protocol.SNAPSHOT
+        assert server.players == 2
+        bad_writer.write(bad_message)
+        while await asyncio.wait_for(bad_reader.read(4096), 5):
+            pass  # drain ticks queued before the drop
+        assert bad_reader.at_eof()
+        assert server.players == 1
+
+        # The room and the well-behaved client carry on
+        assert (await read_message(good_reader))[0] == protocol.TICK
+        bad_writer.close()
+        good_writer.close()
+    finally:
+        server.scheduler.cancel()
+        listener.close()
+        await listener.wait_closed()
+
+def test_malformed_turn_drops_only_its_client():
+    asyncio.run(serve_bad_and_good_clients(protocol.frame(protocol.TURN)))
+
+def test_oversized_frame_drops_only_its_client():
+    asyncio.run(serve_bad_and_good_clients(protocol.FRAME.pack(2 ** 31, protocol.TURN)))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Snake bot tournament runner
+Plays many seeded headless games with a bot policy across a process pool
+and writes per-game results plus summary stats
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from bots import POLICIES, load_policy
+from core import BOARD_HEIGHT, BOARD_WIDTH, Simulation
+
+# One chunk of work: (policy spec, first seed, game count, width, height, max ticks)
+WorkUnit = Tuple[str, int, int, int, int, int]
+
+def play_chunk(unit: WorkUnit) -> Tuple[int, array, array, array]:
+    """Play a run of consecutive seeds; results come back as packed int arrays"""
+    policy_spec, first_seed, count, width, height, max_ticks = unit
+    make_policy = load_policy(policy_spec)
+    sim = Simulation(width, height)
+    scores = array('i')
+    lengths = array('i')
+    ticks = array('i')
+
+    for seed in range(first_seed, first_seed + count):
+        sim.reset(seed)
+        policy = make_policy(seed)
+        step = sim.step
+        done = False
+        while not done and sim.ticks < max_ticks:
+            _, _, done = step(policy(sim))
+        scores.append(sim.score)
+        lengths.append(sim.snake.length)
+        ticks.append(sim.ticks)
+
+    return first_seed, scores, lengths, ticks
+
+def make_work_units(args: argparse.Namespace) -> List[WorkUnit]:
+    units = []
+    for offset in range(0, args.games, args.chunk_size):
+        count = min(args.chunk_size, args.games - offset)
+        units.append((args.policy, args.seed + offset, count,
+                      args.width, args.height, args.max_ticks))
+    return units
+
+def summarize(results: Dict[str, np.ndarray], elapsed: float) -> Dict[str, float]:
+    scores = results['score']
+    return {
+        'games': len(scores),
+        'score_mean': float(scores.mean()),
+        'score_std': float(scores.std()),
+        'score_median': float(np.median(scores)),
+        'score_min': int(scores.min()),
+        'score_max': int(scores.max()),
+        'length_mean': float(results['length'].mean()),
+        'ticks_mean': float(results['ticks'].mean()),
+        'ticks_total': int(results['ticks'].sum()),
+        'elapsed_s': elapsed,
+        'games_per_s': len(scores) / elapsed if elapsed else 0.0,
+        'ticks_per_s': int(results['ticks'].sum()) / elapsed if elapsed else 0.0,
+    }
+
+def run_tournament(args: argparse.Namespace) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+    load_policy(args.policy)  # fail fast on a bad spec before starting workers
+    units = make_work_units(args)
+    start = time.perf_counter()
+
+    if args.workers == 1:
+        chunks = [play_chunk(unit) for unit in units]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            chunks = list(executor.map(play_chunk, units))
+    elapsed = time.perf_counter() - start
+
+    chunks.sort(key=lambda chunk: chunk[0])
+    results = {
+        'seed': np.arange(args.seed, args.seed + args.games, dtype=np.int64),
+        'score': np.concatenate([np.frombuffer(c[1], dtype=np.int32) for c in chunks]),
+        'length': np.concatenate([np.frombuffer(c[2], dtype=np.int32) for c in chunks]),
+        'ticks': np.concatenate([np.frombuffer(c[3], dtype=np.int32) for c in chunks]),
+    }
+    return results, summarize(results, elapsed)
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a headless Snake bot tournament")
+    parser.add_argument('--policy', default='greedy',
+                        help=f"built-in policy name ({', '.join(POLICIES)}) or module:attribute")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=50, help="games per work unit")
+    parser.add_argument('--width', type=int, default=BOARD_WIDTH)
+    parser.add_argument('--height', type=int, default=BOARD_HEIGHT)
+    parser.add_argument('--max-ticks', type=int, default=20000, help="tick limit per game")
+    parser.add_argument('--output', default='tournament_results.npz', help="results file (.npz)")
+    args = parser.parse_args(argv)
+    if args.games < 1 or args.chunk_size < 1 or args.workers < 1:
+        parser.error("--games, --chunk-size and --workers must be positive")
+    if args.width < 2 or args.height < 2:
+        parser.error("--width and --height must be at least 2")
+    return args
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    results, summary = run_tournament(args)
+    np.savez_compressed(args.output, **results, summary=np.array(json.dumps(summary)))
+
+    print(f"🐍 {args.policy}: {summary['games']} games on {args.workers} worker(s)")
+    print(f"   score  mean {summary['score_mean']:.1f}  median {summary['score_median']:.0f}  "
+          f"std {summary['score_std']:.1f}  min {summary['score_min']}  max {summary['score_max']}")
+    print(f"   length mean {summary['length_mean']:.1f}  ticks mean {summary['ticks_mean']:.0f}")
+    # Long-lived policies like autopilot finish well under one game per second
+    rate = (f"{summary['games_per_s']:.0f} games/s" if summary['games_per_s'] >= 1
+            else f"{summary['elapsed_s'] / summary['games']:.2f} s/game")
+    print(f"   {summary['elapsed_s']:.2f}s  {rate}  {summary['ticks_per_s']:.0f} ticks/s")
+    print(f"   results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
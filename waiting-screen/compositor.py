@@ -0,0 +1,112 @@
+"""
+Layered scene compositor
+A scene is a stack of layers drawn bottom to top. Static layers at the bottom
+of the stack are baked into one backdrop; each frame only the areas of the
+dynamic layers are restored from it, redrawn and presented as dirty rects
+"""
+
+import time
+from typing import Callable, List, Optional
+
+import pygame
+
+STATIC = 'static'      # never changes
+PERIODIC = 'periodic'  # changes every `period` seconds
+DYNAMIC = 'dynamic'    # changes every frame
+
+COST_SMOOTHING = 0.05  # weight of the newest sample in each layer's average cost
+
+class Layer:
+    """One drawing step of a scene and the screen area it can ever touch"""
+
+    def __init__(self, name: str, draw: Callable[[], object], kind: str, rect: pygame.Rect,
+                 period: float = 0.0):
+        if kind == PERIODIC and period <= 0:
+            raise ValueError(f"periodic layer '{name}' needs a positive period")
+        self.name = name
+        self.draw = draw
+        self.kind = kind
+        self.rect = pygame.Rect(rect)
+        self.period = period
+        self.cost = 0.0  # smoothed seconds per draw
+        self.draws = 0
+        self.phase = None  # which period was drawn last, for periodic layers
+
+class Compositor:
+    """Draws a stack of layers onto a surface, redrawing only what changes"""
+
+    def __init__(self, surface: pygame.Surface, layers: List[Layer]):
+        self.surface = surface
+        self.layers = layers
+        # The bottom run of non-dynamic layers is the backdrop; everything above is drawn per area
+        self.base = 0
+        while self.base < len(layers) and layers[self.base].kind != DYNAMIC:
+            self.base += 1
+        self.backdrop: Optional[pygame.Surface] = None
+
+    def invalidate(self):
+        """Redraw everything next frame, e.g. after the window was exposed"""
+        self.backdrop = None
+
+    def draw_layer(self, layer: Layer):
+        start = time.perf_counter()
+        layer.draw()
+        elapsed = time.perf_counter() - start
+        layer.cost = elapsed if not layer.draws else layer.cost + (elapsed - layer.cost) * COST_SMOOTHING
+        layer.draws += 1
+
+    def render(self, now: float) -> List[pygame.Rect]:
+        """Bring the surface up to date for time now; returns the rects to present"""
+        dirty = []
+        for index, layer in enumerate(self.layers):
+            if layer.kind == DYNAMIC:
+                dirty.append(layer.rect)
+            elif layer.kind == PERIODIC:
+                phase = int(now // layer.period)
+                if phase != layer.phase:
+                    layer.phase = phase
+                    if index < self.base:
+                        self.backdrop = None
+                    else:
+                        dirty.append(layer.rect)
+
+        surface = self.surface
+        if self.backdrop is None:
+            # Full redraw, keeping a copy of the bottom layers to restore from
+            for layer in self.layers[:self.base]:
+                self.draw_layer(layer)
+            self.backdrop = surface.copy()
+            for layer in self.layers[self.base:]:
+                self.draw_layer(layer)
+            return [surface.get_rect()]
+
+        rects = merge_rects(dirty)
+        for rect in rects:
+            surface.set_clip(rect)
+            surface.blit(self.backdrop, rect, rect)
+            for layer in self.layers[self.base:]:
+                if layer.rect.colliderect(rect):
+                    self.draw_layer(layer)
+        surface.set_clip(None)
+        return rects
+
+    def stats(self) -> List[str]:
+        """One line per layer: kind and average draw cost"""
+        return [f"{layer.name:<12}{layer.kind:<10}{layer.cost * 1000:7.3f} ms  ({layer.draws} draws)"
+                for layer in self.layers]
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Union overlapping rects until none overlap, so no area is redrawn twice"""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        overlapping = True
+        while overlapping:
+            overlapping = False
+            for i, other in enumerate(merged):
+                if rect.colliderect(other):
+                    rect.union_ip(merged.pop(i))
+                    overlapping = True
+                    break
+        merged.append(rect)
+    return merged
@@ -4,19 +4,43 @@
 Beautiful 8-bit style animation with retro aesthetics
 """
 
+import time
+
+# Cold start is measured from here, before pygame is imported (--startup-time)
+IMPORT_START = time.perf_counter()
+
 import pygame
+import numpy as np
+import argparse
 import math
 import sys
-from typing import Tuple
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
 
-# Initialize Pygame
-pygame.init()
+from compositor import DYNAMIC, PERIODIC, STATIC, Compositor, Layer
 
 # Constants
+# The scene is laid out for SCREEN_WIDTH x SCREEN_HEIGHT and scaled to the render resolution
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+TITLE = "WE COME BACK SOON"
+SUBTITLE = "Please wait while we prepare something amazing..."
+
+# A window uncovered or restored needs a full redraw
+EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+
+# Baked glow texts kept per GlowText; enough for every loading percentage
+TEXT_CACHE_SIZE = 128
+
+# Neon glow: halo intensities baked per text, and how bright the blurred halo is
+GLOW_LEVELS = 8
+GLOW_STRENGTH = 2.5
+TITLE_GLOW_RADIUS = 8
+LABEL_GLOW_RADIUS = 3
+
 # 80's Color Palette
 COLORS = {
     'deep_purple': (25, 25, 112),
@@ -34,10 +58,356 @@ COLORS = {
     'white': (255, 255, 255)
 }
 
+# Sunset sky as (position from top 0-1, color) stops, blended linearly between them
+SKY_STOPS = [
+    (0.0, COLORS['deep_purple']),
+    (0.3, COLORS['purple']),
+    (0.6, COLORS['orange']),
+    (1.0, COLORS['yellow']),
+]
+
+# Loading bar fill, left to right
+LOADING_STOPS = [(0.0, COLORS['magenta']), (1.0, COLORS['cyan'])]
+LOADING_BAR_SIZE = (300, 20)
+
+# Optional slow hue drift of the sky: degrees either way, baked gradients, seconds per cycle
+SKY_HUE_SHIFT = 0.0
+SKY_HUE_STEPS = 16
+SKY_HUE_PERIOD = 20.0
+
+# Sun: rays every SUN_RAY_SPACING degrees, pre-rotated in SUN_RAY_ANGLE_STEP steps,
+# with lengths between SUN_RAY_LENGTHS quantized to SUN_RAY_LENGTH_STEPS sprites
+SUN_RADIUS = 50
+SUN_Y = 150
+SUN_BOB = 20  # pixels the sun drifts up and down
+SUN_RAY_SPACING = 15
+SUN_RAY_ANGLE_STEP = 1.0
+SUN_RAY_LENGTHS = (70, 90)
+SUN_RAY_LENGTH_STEPS = 5
+
+# Ocean: wave heights sampled every WAVE_STEP pixels across the screen
+WAVE_STEP = 10
+REFLECTION_COLOR = (0, 200, 255)
+
+# Palm trees: sway phases baked per tree sprite over one full sway cycle
+PALM_SWAY_STEPS = 64
+TRUNK_COLOR = (101, 67, 33)
+
+def box_blur(values: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    """Mean over a 2 * radius + 1 window along one axis, zero outside, same shape"""
+    size = 2 * radius + 1
+    n = values.shape[axis]
+    pad = [(radius + 1, radius) if a == axis else (0, 0) for a in range(values.ndim)]
+    sums = np.cumsum(np.pad(values, pad), axis=axis)
+    return (np.take(sums, np.arange(size, size + n), axis=axis)
+            - np.take(sums, np.arange(n), axis=axis)) / size
+
+class GlowText:
+    """
+    Text with a neon halo. Halos are blurred with NumPy once per text and
+    quantized glow level, so drawing is at most two blits: halo, then text
+    """
+    
+    def __init__(self, font: pygame.font.Font, color: Tuple[int, int, int],
+                 glow_color: Tuple[int, int, int], radius: int,
+                 levels: int = GLOW_LEVELS, capacity: int = TEXT_CACHE_SIZE):
+        self.font = font
+        self.color = color
+        self.glow_color = glow_color
+        self.radius = radius
+        self.levels = levels
+        self.capacity = capacity
+        self.pad = 2 * radius  # two box blur passes spread the halo twice the radius
+        # text -> [text surface, halo for levels 1..levels or None until first used]
+        self.baked = OrderedDict()
+    
+    def draw(self, surface: pygame.Surface, text: str, center: Tuple[int, int],
+             glow: float = 1.0) -> pygame.Rect:
+        """Blit text centered with a halo of glow 0-1; returns the rect touched"""
+        entry = self.baked.get(text)
+        if entry is None:
+            entry = self.baked[text] = [self.font.render(text, True, self.color)] + [None] * self.levels
+            if len(self.baked) > self.capacity:
+                self.baked.popitem(last=False)
+        else:
+            self.baked.move_to_end(text)
+        
+        text_surface = entry[0]
+        level = round(max(0.0, min(1.0, glow)) * self.levels)
+        if not level:
+            return surface.blit(text_surface, text_surface.get_rect(center=center))
+        halo = entry[level]
+        if halo is None:
+            halo = entry[level] = self.build_halo(text_surface, level)
+        halo_rect = surface.blit(halo, halo.get_rect(center=center))
+        surface.blit(text_surface, text_surface.get_rect(center=center))
+        return halo_rect
+    
+    def bounds(self, text: str, center: Tuple[int, int]) -> pygame.Rect:
+        """Area draw() can touch for this text at any glow level"""
+        width, height = self.font.size(text)
+        rect = pygame.Rect(0, 0, width + 2 * self.pad, height + 2 * self.pad)
+        rect.center = center
+        return rect
+    
+    def build_halo(self, text_surface: pygame.Surface, level: int) -> pygame.Surface:
+        radius = max(1, round(self.radius * level / self.levels))
+        alpha = np.pad(pygame.surfarray.array_alpha(text_surface).astype(np.float32), self.pad)
+        for axis in (0, 1):
+            alpha = box_blur(box_blur(alpha, radius, axis), radius, axis)
+        halo = pygame.Surface(alpha.shape, pygame.SRCALPHA)
+        halo.fill(self.glow_color)
+        pixels = pygame.surfarray.pixels_alpha(halo)
+        pixels[:] = np.clip(alpha * GLOW_STRENGTH, 0, 255).astype(np.uint8)
+        del pixels  # unlock the surface
+        return halo
+
+def hue_rotation(degrees: float) -> np.ndarray:
+    """RGB matrix rotating hue while roughly keeping luminance (as CSS hue-rotate)"""
+    c, s = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+    return np.array([
+        [0.213 + c * 0.787 - s * 0.213, 0.715 - c * 0.715 - s * 0.715, 0.072 - c * 0.072 + s * 0.928],
+        [0.213 - c * 0.213 + s * 0.143, 0.715 + c * 0.285 + s * 0.140, 0.072 - c * 0.072 - s * 0.283],
+        [0.213 - c * 0.213 - s * 0.787, 0.715 - c * 0.715 + s * 0.715, 0.072 + c * 0.928 + s * 0.072],
+    ])
+
+ColorStops = Sequence[Tuple[float, Tuple[int, int, int]]]
+
+def blend_stops(stops: ColorStops, count: int) -> np.ndarray:
+    """count x 3 float colors sampled at i / count between (position 0-1, color) stops"""
+    positions = np.array([position for position, _ in stops], dtype=float)
+    colors = np.array([color for _, color in stops], dtype=float)
+    ratios = np.arange(count) / count
+    return np.stack([np.interp(ratios, positions, colors[:, channel]) for channel in range(3)], axis=1)
+
+class SkyGradient:
+    """Vertical gradient surfaces baked with NumPy, cached per resolution and hue step"""
+    
+    def __init__(self, stops: ColorStops = SKY_STOPS, hue_shift: float = SKY_HUE_SHIFT,
+                 hue_steps: int = SKY_HUE_STEPS, hue_period: float = SKY_HUE_PERIOD):
+        self.stops = stops
+        self.hue_shift = hue_shift
+        self.hue_steps = hue_steps if hue_shift else 1
+        self.hue_period = hue_period
+        self.surfaces: Dict[Tuple[Tuple[int, int], int], pygame.Surface] = {}
+    
+    def surface(self, size: Tuple[int, int], time: float = 0.0) -> pygame.Surface:
+        """The gradient for this size; with a hue shift, the baked step for this time"""
+        step = int(time / self.hue_period * self.hue_steps) % self.hue_steps
+        key = (size, step)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = self.build(size, step)
+        return surface
+    
+    def build(self, size: Tuple[int, int], step: int) -> pygame.Surface:
+        width, height = size
+        column = blend_stops(self.stops, height)
+        if step:
+            # Steps sweep the hue out to +hue_shift, back through zero to -hue_shift and home
+            degrees = self.hue_shift * math.sin(2 * math.pi * step / self.hue_steps)
+            column = column @ hue_rotation(degrees).T
+        column = np.clip(column, 0, 255).astype(np.uint8)
+        surface = pygame.Surface(size)
+        pygame.surfarray.blit_array(surface, np.broadcast_to(column, (width, height, 3)))
+        return surface.convert()
+
+class LoadingBar:
+    """
+    Framed gradient progress bar with a percentage label. The gradient is baked
+    into one strip, so progress is a single area blit of its filled part
+    """
+    
+    def __init__(self, font: pygame.font.Font, size: Tuple[int, int] = LOADING_BAR_SIZE,
+                 stops: ColorStops = LOADING_STOPS, border: int = 2,
+                 label_color: Tuple[int, int, int] = COLORS['white'],
+                 glow_color: Tuple[int, int, int] = COLORS['pink'],
+                 label_offset: int = 20, glow_radius: int = LABEL_GLOW_RADIUS):
+        width, height = size
+        self.size = size
+        self.border = border
+        self.label_offset = label_offset  # from the top of the track to the label's center
+        
+        self.strip = pygame.Surface(size)
+        colors = blend_stops(stops, width).astype(np.uint8)
+        pygame.surfarray.blit_array(self.strip, np.broadcast_to(colors[:, None], (width, height, 3)))
+        self.strip = self.strip.convert()
+        
+        # Black border around an empty white track
+        self.frame = pygame.Surface((width + 2 * border, height + 2 * border))
+        self.frame.fill(COLORS['black'])
+        self.frame.fill(COLORS['white'], (border, border, width, height))
+        self.frame = self.frame.convert()
+        
+        # One baked label per whole percentage, 0 to 100
+        self.label = GlowText(font, label_color, glow_color, glow_radius, capacity=101)
+    
+    def draw(self, surface: pygame.Surface, center: Tuple[int, int], progress: float) -> pygame.Rect:
+        """Draw the bar centered on center with progress 0-1; returns the rect touched"""
+        width, height = self.size
+        progress = max(0.0, min(1.0, progress))
+        rect = surface.blit(self.frame, self.frame.get_rect(center=center))
+        surface.blit(self.strip, rect.inflate(-2 * self.border, -2 * self.border),
+                     (0, 0, int(width * progress), height))
+        label_rect = self.label.draw(surface, f"Loading... {int(progress * 100)}%",
+                                     self.label_center(center), 0.5)
+        return rect.union(label_rect)
+    
+    def label_center(self, center: Tuple[int, int]) -> Tuple[int, int]:
+        return center[0], center[1] - self.size[1] // 2 - self.label_offset
+    
+    def bounds(self, center: Tuple[int, int]) -> pygame.Rect:
+        """Area draw() can touch at any progress; 100% is the widest label"""
+        rect = self.frame.get_rect(center=center)
+        return rect.union(self.label.bounds("Loading... 100%", self.label_center(center)))
+
+class Sun:
+    """
+    Sun disc baked once, plus its ray ring baked per quantized rotation and
+    length; the ring repeats every ray spacing, so few rotations are needed
+    """
+    
+    def __init__(self, radius: int = SUN_RADIUS, ray_spacing: int = SUN_RAY_SPACING,
+                 angle_step: float = SUN_RAY_ANGLE_STEP,
+                 ray_lengths: Tuple[int, int] = SUN_RAY_LENGTHS,
+                 length_steps: int = SUN_RAY_LENGTH_STEPS, ray_width: int = 3):
+        self.radius = radius
+        self.ray_spacing = ray_spacing
+        self.angles = max(1, round(ray_spacing / angle_step))
+        self.ray_lengths = ray_lengths
+        self.length_steps = length_steps
+        self.ray_width = ray_width
+        self.half = ray_lengths[1] + 2  # ray sprites are 2 * half square, centered on the sun
+        self.rays: Dict[Tuple[int, int], pygame.Surface] = {}
+        
+        # Concentric circles, brighter towards the rim
+        size = 2 * radius + 2
+        self.disc = self.sprite(size)
+        for r in range(radius, 0, -2):
+            intensity = min(255, 200 + r)
+            pygame.draw.circle(self.disc, (intensity, intensity - 50, 0), (radius + 1, radius + 1), r)
+    
+    @staticmethod
+    def sprite(size: int) -> pygame.Surface:
+        # Hard-edged shapes, so a run-length encoded colorkey blits faster than per-pixel alpha
+        sprite = pygame.Surface((size, size)).convert()
+        sprite.fill(COLORS['black'])
+        sprite.set_colorkey(COLORS['black'], pygame.RLEACCEL)
+        return sprite
+    
+    def draw(self, surface: pygame.Surface, center: Tuple[int, int], angle: float,
+             ray_length: float) -> pygame.Rect:
+        """Rays rotated by angle degrees, then the disc; returns the rect touched"""
+        angle_index = round(angle % self.ray_spacing / self.ray_spacing * self.angles) % self.angles
+        shortest, longest = self.ray_lengths
+        length_ratio = (min(max(ray_length, shortest), longest) - shortest) / max(1, longest - shortest)
+        length_index = round(length_ratio * (self.length_steps - 1))
+        key = (angle_index, length_index)
+        rays = self.rays.get(key)
+        if rays is None:
+            rays = self.rays[key] = self.build_rays(*key)
+        rect = surface.blit(rays, rays.get_rect(center=center))
+        surface.blit(self.disc, self.disc.get_rect(center=center))
+        return rect
+    
+    def build_rays(self, angle_index: int, length_index: int) -> pygame.Surface:
+        shortest, longest = self.ray_lengths
+        length = shortest + (longest - shortest) * length_index / max(1, self.length_steps - 1)
+        half = self.half
+        rays = self.sprite(2 * half)
+        offset = angle_index * self.ray_spacing / self.angles
+        for angle in range(0, 360, self.ray_spacing):
+            rad = math.radians(angle + offset)
+            start = (half + self.radius * math.cos(rad), half + self.radius * math.sin(rad))
+            end = (half + length * math.cos(rad), half + length * math.sin(rad))
+            pygame.draw.line(rays, COLORS['yellow'], start, end, self.ray_width)
+        return rays
+
+class PalmTree:
+    """Palm tree sprites looked up by sway phase; each phase is drawn once, then blitted"""
+    
+    # Room around the trunk base for the fronds at full sway, at scale 1
+    LEFT, TOP, WIDTH, HEIGHT = 20, 120, 100, 130
+    
+    def __init__(self, steps: int = PALM_SWAY_STEPS, scale: float = 1.0):
+        self.steps = steps
+        self.scale = scale
+        self.left, self.top = math.ceil(self.LEFT * scale), math.ceil(self.TOP * scale)
+        self.width, self.height = math.ceil(self.WIDTH * scale), math.ceil(self.HEIGHT * scale)
+        self.sprites: List[Optional[Tuple[pygame.Surface, Tuple[int, int]]]] = [None] * steps
+    
+    def draw(self, surface: pygame.Surface, x: int, y: int, phase: float) -> pygame.Rect:
+        """Blit the tree with its trunk base at (x, y), swayed by sin(phase)"""
+        index = round(phase / (2 * math.pi) * self.steps) % self.steps
+        entry = self.sprites[index]
+        if entry is None:
+            entry = self.sprites[index] = self.build(index)
+        sprite, (dx, dy) = entry
+        return surface.blit(sprite, (x + dx, y + dy))
+    
+    def bounds(self, x: int, y: int) -> pygame.Rect:
+        """Area a tree based at (x, y) can touch at any sway"""
+        return pygame.Rect(x - self.left, y - self.top, self.width, self.height)
+    
+    def build(self, index: int) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        sway = 5 * math.sin(2 * math.pi * index / self.steps)
+        scale = self.scale
+        x, y = self.left, self.top
+        canvas = pygame.Surface((self.width, self.height)).convert()
+        canvas.fill(COLORS['black'])
+        
+        # Tree trunk
+        tip_x, tip_y = x + (5 + sway) * scale, y - 60 * scale
+        trunk_points = [(x, y), (tip_x, tip_y), (x + (8 + sway) * scale, tip_y), (x + 3 * scale, y)]
+        pygame.draw.polygon(canvas, TRUNK_COLOR, trunk_points)
+        
+        # Palm fronds, each with three side details
+        frond_width, detail_width = max(1, round(4 * scale)), max(1, round(2 * scale))
+        for angle in (-60, -30, 0, 30, 60):
+            angle_rad = math.radians(angle + sway * 2)
+            end_x = tip_x + 40 * scale * math.cos(angle_rad)
+            end_y = tip_y + 40 * scale * math.sin(angle_rad)
+            pygame.draw.line(canvas, COLORS['palm_green'], (tip_x, tip_y), (end_x, end_y), frond_width)
+            offset = 8 * scale * math.sin(angle_rad + math.pi / 2)
+            for i in range(3):
+                detail_x = tip_x + (end_x - tip_x) * (i + 1) / 4
+                detail_y = tip_y + (end_y - tip_y) * (i + 1) / 4
+                pygame.draw.line(canvas, COLORS['palm_green'], (detail_x, detail_y),
+                                 (detail_x + offset, detail_y + offset / 2), detail_width)
+        
+        # Crop to what was drawn, remembering where the trunk base sits
+        canvas.set_colorkey(COLORS['black'])
+        bounds = canvas.get_bounding_rect()
+        sprite = canvas.subsurface(bounds).copy()
+        sprite.set_colorkey(COLORS['black'], pygame.RLEACCEL)
+        return sprite, (bounds.x - x, bounds.y - y)
+
 class WaitingScreen:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    def __init__(self, hue_shift: float = SKY_HUE_SHIFT, resolution: Optional[Tuple[int, int]] = None,
+                 fullscreen: bool = False, window_size: Optional[Tuple[int, int]] = None):
+        self.startup_marks = [("imports", time.perf_counter())]
+        
+        # Start only display and fonts; audio and joystick init slows a kiosk boot
+        pygame.display.init()
+        pygame.font.init()
+        if fullscreen:
+            # (0, 0) is the display's native resolution
+            self.display = pygame.display.set_mode(window_size or (0, 0), pygame.FULLSCREEN)
+            pygame.mouse.set_visible(False)
+        else:
+            self.display = pygame.display.set_mode(window_size or default_window_size(resolution))
         pygame.display.set_caption("We Come Back Soon - 80's Waiting Screen")
+        self.startup_marks.append(("window", time.perf_counter()))
+        
+        # Render straight into the window, or into a low resolution surface that is upscaled
+        if resolution is None or tuple(resolution) == self.display.get_size():
+            self.screen = self.display
+        else:
+            self.screen = pygame.Surface(resolution).convert()
+        self.viewport, self.upscale = fit_viewport(self.screen.get_size(), self.display.get_size())
+        self.width, self.height = self.screen.get_size()
+        self.scale_x, self.scale_y = self.width / SCREEN_WIDTH, self.height / SCREEN_HEIGHT
+        self.scale = min(self.scale_x, self.scale_y)
         self.clock = pygame.time.Clock()
         self.time = 0
         
@@ -47,228 +417,226 @@ class WaitingScreen:
         self.palm_sway = 0
         self.text_glow = 0
         
-        # Font setup
-        self.large_font = pygame.font.Font(None, 48)
-        self.medium_font = pygame.font.Font(None, 32)
+        self.sky = SkyGradient(hue_shift=hue_shift)
+        self.sun = Sun(radius=self.scene_size(SUN_RADIUS),
+                       ray_lengths=tuple(self.scene_size(length) for length in SUN_RAY_LENGTHS),
+                       ray_width=self.scene_size(3))
+        self.palm_tree = PalmTree(scale=self.scale)
+        
+        # Layout, scaled from SCREEN_WIDTH x SCREEN_HEIGHT
+        self.title_center = (self.width // 2, self.scene_y(80))
+        self.subtitle_center = (self.width // 2, self.scene_y(120))
+        self.loading_center = (self.width // 2, self.scene_y(SCREEN_HEIGHT - 40))
+        island_y = SCREEN_HEIGHT - 180
+        self.island_points = [(self.scene_x(x), self.scene_y(y)) for x, y in (
+            (100, island_y), (150, island_y - 30), (200, island_y - 40), (250, island_y - 35),
+            (300, island_y - 20), (350, island_y - 25), (400, island_y - 10), (450, island_y),
+            (450, SCREEN_HEIGHT), (100, SCREEN_HEIGHT))]
+        self.palm_positions = [(self.scene_x(x), self.scene_y(y)) for x, y in
+                               ((180, island_y - 30), (320, island_y - 20), (380, island_y - 5))]
+        
+        # Wave x positions and their phase terms never change; the two last points close the polygon
+        wave_step = max(1, self.scene_x(WAVE_STEP))
+        wave_x = np.arange(0, self.width + 2 * wave_step, wave_step, dtype=float)
+        layout_x = wave_x / self.scale_x
+        self.wave_phases = (layout_x * 0.02, layout_x * 0.015)
+        self.wave_points = np.empty((len(wave_x) + 2, 2))
+        self.wave_points[:-2, 0] = wave_x
+        self.wave_points[-2:] = ((self.width, self.height), (0, self.height))
+    
+    def scene_x(self, x: float) -> int:
+        """Horizontal layout position in render pixels"""
+        return round(x * self.scale_x)
+    
+    def scene_y(self, y: float) -> int:
+        """Vertical layout position in render pixels"""
+        return round(y * self.scale_y)
+    
+    def scene_size(self, length: float) -> int:
+        """Font size, radius or line width in render pixels; never below one"""
+        return max(1, round(length * self.scale))
+    
+    @cached_property
+    def large_font(self) -> pygame.font.Font:
+        """Title font, loaded on first use"""
+        return pygame.font.Font(None, self.scene_size(48))
+    
+    @cached_property
+    def medium_font(self) -> pygame.font.Font:
+        """Subtitle and loading label font, loaded on first use"""
+        return pygame.font.Font(None, self.scene_size(32))
+    
+    @cached_property
+    def title_text(self) -> GlowText:
+        return GlowText(self.large_font, COLORS['white'], COLORS['magenta'],
+                        self.scene_size(TITLE_GLOW_RADIUS))
+    
+    @cached_property
+    def subtitle_text(self) -> GlowText:
+        return GlowText(self.medium_font, COLORS['cyan'], COLORS['deep_purple'],
+                        self.scene_size(LABEL_GLOW_RADIUS))
+    
+    @cached_property
+    def loading_bar(self) -> LoadingBar:
+        width, height = LOADING_BAR_SIZE
+        return LoadingBar(self.medium_font, (self.scene_size(width), self.scene_size(height)),
+                          border=self.scene_size(2), label_offset=self.scene_size(20),
+                          glow_radius=self.scene_size(LABEL_GLOW_RADIUS))
+    
+    @cached_property
+    def layers(self) -> List[Layer]:
+        """The scene bottom to top, with what animates each layer and where it can draw"""
+        half = self.sun.half
+        sun_top, sun_bottom = self.scene_y(SUN_Y - SUN_BOB), self.scene_y(SUN_Y + SUN_BOB)
+        sun_rays = pygame.Rect(self.width // 2 - half, sun_top - half, 2 * half, sun_bottom - sun_top + 2 * half)
+        xs, ys = zip(*self.island_points)
+        island = pygame.Rect(min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1)
+        palms = [self.palm_tree.bounds(x, y) for x, y in self.palm_positions]
+        # Crests rise up to 25 layout pixels above the ocean line
+        ocean_top = self.scene_y(SCREEN_HEIGHT - 200) - math.ceil(25 * self.scale_y)
+        grid_top = self.scene_y(SCREEN_HEIGHT - 120)
+        sky_kind, sky_period = STATIC, 0.0
+        if self.sky.hue_shift:
+            sky_kind, sky_period = PERIODIC, self.sky.hue_period / self.sky.hue_steps
+        return [
+            Layer("sky", self.draw_gradient_background, sky_kind, self.screen.get_rect(), sky_period),
+            Layer("sun", self.draw_sun, DYNAMIC, sun_rays),
+            Layer("ocean", self.draw_ocean, DYNAMIC,
+                  pygame.Rect(0, ocean_top, self.width, self.height - ocean_top)),
+            Layer("island", self.draw_island, STATIC, island),
+            Layer("palms", self.draw_palm_trees, DYNAMIC, palms[0].unionall(palms[1:])),
+            Layer("grid", self.draw_grid_effect, DYNAMIC,
+                  pygame.Rect(0, grid_top, self.width, self.height - grid_top)),
+            Layer("title", self.draw_title, DYNAMIC, self.title_text.bounds(TITLE, self.title_center)),
+            Layer("subtitle", self.draw_subtitle, STATIC,
+                  self.subtitle_text.bounds(SUBTITLE, self.subtitle_center)),
+            Layer("loading", self.draw_loading_animation, DYNAMIC,
+                  self.loading_bar.bounds(self.loading_center)),
+        ]
+    
+    @cached_property
+    def compositor(self) -> Compositor:
+        return Compositor(self.screen, self.layers)
         
     def draw_gradient_background(self):
         """Draw the gradient sky background"""
-        for y in range(SCREEN_HEIGHT):
-            # Create sunset gradient from top to bottom
-            ratio = y / SCREEN_HEIGHT
-            
-            if ratio < 0.3:  # Top sky - deep purple to purple
-                r = int(25 + (75 - 25) * (ratio / 0.3))
-                g = int(25 + (0 - 25) * (ratio / 0.3))
-                b = int(112 + (130 - 112) * (ratio / 0.3))
-            elif ratio < 0.6:  # Middle sky - purple to pink/orange
-                local_ratio = (ratio - 0.3) / 0.3
-                r = int(75 + (255 - 75) * local_ratio)
-                g = int(0 + (140 - 0) * local_ratio)
-                b = int(130 + (0 - 130) * local_ratio)
-            else:  # Bottom sky - orange to yellow
-                local_ratio = (ratio - 0.6) / 0.4
-                r = int(255)
-                g = int(140 + (215 - 140) * local_ratio)
-                b = int(0)
-            
-            color = (min(255, r), min(255, g), min(255, b))
-            pygame.draw.line(self.screen, color, (0, y), (SCREEN_WIDTH, y))
+        # Baked once per resolution (and hue step); a frame is a single blit
+        self.screen.blit(self.sky.surface(self.screen.get_size(), self.time), (0, 0))
     
     def draw_sun(self):
         """Draw the animated sun with pulsing effect"""
-        sun_x = SCREEN_WIDTH // 2
-        sun_y = int(150 + 20 * math.sin(self.sun_pulse))
-        
-        # Sun rays
-        ray_length = 80 + 10 * math.sin(self.sun_pulse * 2)
-        for angle in range(0, 360, 15):
-            rad = math.radians(angle + self.time)
-            start_x = sun_x + 50 * math.cos(rad)
-            start_y = sun_y + 50 * math.sin(rad)
-            end_x = sun_x + ray_length * math.cos(rad)
-            end_y = sun_y + ray_length * math.sin(rad)
-            pygame.draw.line(self.screen, COLORS['yellow'], (start_x, start_y), (end_x, end_y), 3)
-        
-        # Sun circle with gradient effect
-        for radius in range(50, 0, -2):
-            alpha = 255 - (50 - radius) * 3
-            color_intensity = min(255, 200 + radius)
-            sun_color = (color_intensity, color_intensity - 50, 0)
-            pygame.draw.circle(self.screen, sun_color, (sun_x, sun_y), radius)
+        sun_y = self.scene_y(int(SUN_Y + SUN_BOB * math.sin(self.sun_pulse)))
+        ray_length = (80 + 10 * math.sin(self.sun_pulse * 2)) * self.scale
+        self.sun.draw(self.screen, (self.width // 2, sun_y), self.time, ray_length)
     
     def draw_ocean(self):
         """Draw the animated ocean with waves"""
-        ocean_y = SCREEN_HEIGHT - 200
+        ocean_y = self.scene_y(SCREEN_HEIGHT - 200)
         
         # Ocean base
-        ocean_rect = pygame.Rect(0, ocean_y, SCREEN_WIDTH, 200)
+        ocean_rect = pygame.Rect(0, ocean_y, self.width, self.height - ocean_y)
         pygame.draw.rect(self.screen, COLORS['ocean_blue'], ocean_rect)
         
-        # Animated waves
-        wave_points = []
-        for x in range(0, SCREEN_WIDTH + 20, 10):
-            wave_height = 15 * math.sin((x + self.wave_offset) * 0.02) + 10 * math.sin((x + self.wave_offset * 1.5) * 0.015)
-            wave_points.append((x, ocean_y + wave_height))
+        # Animated waves over the precomputed x axis
+        phase_a, phase_b = self.wave_phases
+        points = self.wave_points
+        points[:-2, 1] = ocean_y + self.scale_y * (15 * np.sin(phase_a + self.wave_offset * 0.02)
+                                                   + 10 * np.sin(phase_b + self.wave_offset * 1.5 * 0.015))
+        pygame.draw.polygon(self.screen, COLORS['cyan'], points.tolist())
         
-        # Add bottom corners to close the polygon
-        wave_points.append((SCREEN_WIDTH, SCREEN_HEIGHT))
-        wave_points.append((0, SCREEN_HEIGHT))
-        
-        pygame.draw.polygon(self.screen, COLORS['cyan'], wave_points)
-        
-        # Wave reflections
-        for i in range(len(wave_points) - 2):
-            x, y = wave_points[i]
-            next_x, next_y = wave_points[i + 1]
-            reflection_color = (0, 200, 255, 100)
-            pygame.draw.line(self.screen, reflection_color, (x, y + 20), (next_x, next_y + 20), 2)
+        # Wave reflections, as one polyline under the crests
+        reflection = points[:-2].copy()
+        reflection[:, 1] += self.scene_y(20)
+        pygame.draw.lines(self.screen, REFLECTION_COLOR, False, reflection.tolist(), self.scene_size(2))
     
     def draw_island(self):
         """Draw the island silhouette"""
-        island_y = SCREEN_HEIGHT - 180
-        
-        # Island shape
-        island_points = [
-            (100, island_y),
-            (150, island_y - 30),
-            (200, island_y - 40),
-            (250, island_y - 35),
-            (300, island_y - 20),
-            (350, island_y - 25),
-            (400, island_y - 10),
-            (450, island_y),
-            (450, SCREEN_HEIGHT),
-            (100, SCREEN_HEIGHT)
-        ]
-        
-        pygame.draw.polygon(self.screen, COLORS['palm_green'], island_points)
-        
-        # Palm trees
-        self.draw_palm_tree(180, island_y - 30)
-        self.draw_palm_tree(320, island_y - 20)
-        self.draw_palm_tree(380, island_y - 5)
+        pygame.draw.polygon(self.screen, COLORS['palm_green'], self.island_points)
+    
+    def draw_palm_trees(self):
+        """Draw the palm trees on the island"""
+        for x, y in self.palm_positions:
+            self.draw_palm_tree(x, y)
     
     def draw_palm_tree(self, x: int, y: int):
         """Draw an animated palm tree"""
-        sway = 5 * math.sin(self.palm_sway + x * 0.01)
-        
-        # Tree trunk
-        trunk_points = [
-            (x, y),
-            (x + 5 + sway, y - 60),
-            (x + 8 + sway, y - 60),
-            (x + 3, y)
-        ]
-        pygame.draw.polygon(self.screen, (101, 67, 33), trunk_points)
-        
-        # Palm fronds
-        frond_tip_x = x + 5 + sway
-        frond_tip_y = y - 60
-        
-        frond_angles = [-60, -30, 0, 30, 60]
-        for angle in frond_angles:
-            angle_rad = math.radians(angle + sway * 2)
-            frond_length = 40
-            end_x = frond_tip_x + frond_length * math.cos(angle_rad)
-            end_y = frond_tip_y + frond_length * math.sin(angle_rad)
-            
-            # Draw frond
-            pygame.draw.line(self.screen, COLORS['palm_green'], 
-                           (frond_tip_x, frond_tip_y), (end_x, end_y), 4)
-            
-            # Add frond details
-            for i in range(3):
-                detail_x = frond_tip_x + (end_x - frond_tip_x) * (i + 1) / 4
-                detail_y = frond_tip_y + (end_y - frond_tip_y) * (i + 1) / 4
-                offset = 8 * math.sin(angle_rad + math.pi/2)
-                pygame.draw.line(self.screen, COLORS['palm_green'],
-                               (detail_x, detail_y), 
-                               (detail_x + offset, detail_y + offset/2), 2)
+        self.palm_tree.draw(self.screen, x, y, self.palm_sway + x / self.scale_x * 0.01)
     
     def draw_grid_effect(self):
         """Draw retro grid effect at the bottom"""
-        grid_y_start = SCREEN_HEIGHT - 120
-        grid_spacing = 30
+        width, height = self.width, self.height
+        grid_y_start = self.scene_y(SCREEN_HEIGHT - 120)
+        grid_spacing = 30 * self.scale_y
         line_color = (*COLORS['cyan'], 100)
         
         # Horizontal lines with perspective
         for i in range(4):
-            y = grid_y_start + i * grid_spacing
-            line_width = 2 if i % 2 == 0 else 1
+            y = grid_y_start + round(i * grid_spacing)
+            line_width = self.scene_size(2) if i % 2 == 0 else 1
             # Create perspective effect
-            left_x = int(SCREEN_WIDTH * 0.2 * (4 - i) / 4)
-            right_x = int(SCREEN_WIDTH - SCREEN_WIDTH * 0.2 * (4 - i) / 4)
+            left_x = int(width * 0.2 * (4 - i) / 4)
+            right_x = int(width - width * 0.2 * (4 - i) / 4)
             pygame.draw.line(self.screen, COLORS['cyan'], (left_x, y), (right_x, y), line_width)
         
         # Vertical lines
         for i in range(-10, 11):
-            x_offset = i * 40 + self.time * 2
-            if -50 < x_offset < SCREEN_WIDTH + 50:
-                x = SCREEN_WIDTH // 2 + x_offset
+            x_offset = (i * 40 + self.time * 2) * self.scale_x
+            if -50 * self.scale_x < x_offset < width + 50 * self.scale_x:
+                x = width // 2 + x_offset
                 pygame.draw.line(self.screen, COLORS['cyan'], 
-                               (x, grid_y_start), (x, SCREEN_HEIGHT), 1)
+                               (x, grid_y_start), (x, height), 1)
     
-    def draw_text(self):
+    def draw_title(self):
         """Draw the main title with glow effect"""
-        title_text = "WE COME BACK SOON"
-        
-        # Glow effect
-        glow_intensity = int(20 + 10 * math.sin(self.text_glow))
-        
-        # Multiple layers for glow
-        for offset in range(glow_intensity, 0, -2):
-            glow_color = (255, 0, 255, 255 - offset * 8)
-            text_surface = self.large_font.render(title_text, True, COLORS['magenta'])
-            text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, 80))
-            
-            # Draw glow layers
-            for dx in [-offset, 0, offset]:
-                for dy in [-offset, 0, offset]:
-                    if dx != 0 or dy != 0:
-                        self.screen.blit(text_surface, (text_rect.x + dx, text_rect.y + dy))
-        
-        # Main text
-        text_surface = self.large_font.render(title_text, True, COLORS['white'])
-        text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, 80))
-        self.screen.blit(text_surface, text_rect)
-        
-        # Subtitle
-        subtitle_text = "Please wait while we prepare something amazing..."
-        subtitle_surface = self.medium_font.render(subtitle_text, True, COLORS['cyan'])
-        subtitle_rect = subtitle_surface.get_rect(center=(SCREEN_WIDTH // 2, 120))
-        self.screen.blit(subtitle_surface, subtitle_rect)
+        # Pulsing glow, picked from the baked halo levels
+        glow = (20 + 10 * math.sin(self.text_glow)) / 30
+        self.title_text.draw(self.screen, TITLE, self.title_center, glow)
+    
+    def draw_subtitle(self):
+        """Draw the subtitle under the title"""
+        self.subtitle_text.draw(self.screen, SUBTITLE, self.subtitle_center, 0.5)
     
     def draw_loading_animation(self):
         """Draw a retro loading animation"""
-        loading_y = SCREEN_HEIGHT - 50
-        loading_width = 300
-        loading_x = (SCREEN_WIDTH - loading_width) // 2
-        
-        # Loading bar background
-        pygame.draw.rect(self.screen, COLORS['black'], 
-                        (loading_x - 2, loading_y - 2, loading_width + 4, 24))
-        pygame.draw.rect(self.screen, COLORS['white'], 
-                        (loading_x, loading_y, loading_width, 20))
-        
         # Animated loading progress
         progress = (math.sin(self.time * 0.1) + 1) / 2  # 0 to 1
-        progress_width = int(loading_width * progress)
+        self.loading_bar.draw(self.screen, self.loading_center, progress)
+    
+    def draw(self):
+        """Draw everything for the current frame"""
+        for layer in self.layers:
+            layer.draw()
+    
+    def present(self, rects: List[pygame.Rect]):
+        """Show the rendered rects, upscaled to the window when rendering at a lower resolution"""
+        if self.screen is self.display:
+            pygame.display.update(rects)
+            return
         
-        # Gradient loading bar
-        for i in range(progress_width):
-            color_ratio = i / loading_width
-            r = int(255 * (1 - color_ratio) + 0 * color_ratio)
-            g = int(0 * (1 - color_ratio) + 255 * color_ratio)
-            b = int(255 * (1 - color_ratio) + 255 * color_ratio)
-            pygame.draw.line(self.screen, (r, g, b), 
-                           (loading_x + i, loading_y), (loading_x + i, loading_y + 20))
+        bounds = self.screen.get_rect()
+        if self.upscale:
+            # Whole multiples line up pixel for pixel, so only the changed rects are scaled
+            factor, shown = self.upscale, []
+            source = pygame.surfarray.pixels2d(self.screen)
+            target = pygame.surfarray.pixels2d(self.display)
+            for rect in rects:
+                rect = rect.clip(bounds)
+                if rect:
+                    area = pygame.Rect(self.viewport.x + rect.x * factor, self.viewport.y + rect.y * factor,
+                                       rect.w * factor, rect.h * factor)
+                    upscale_pixels(source[rect.left:rect.right, rect.top:rect.bottom],
+                                   target[area.left:area.right, area.top:area.bottom], factor)
+                    shown.append(area)
+            del source, target  # unlock both surfaces
+        else:
+            pygame.transform.scale(self.screen, self.viewport.size, self.display.subsurface(self.viewport))
+            shown = [self.viewport]
         
-        # Loading text
-        loading_text = f"Loading... {int(progress * 100)}%"
-        text_surface = self.medium_font.render(loading_text, True, COLORS['white'])
-        text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, loading_y - 20))
-        self.screen.blit(text_surface, text_rect)
+        # A full frame (the first, or after an expose) also repaints the letterbox bars
+        if bounds in rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(shown)
     
     def update_animations(self, dt: float):
         """Update all animation variables"""
@@ -283,14 +651,22 @@ class WaitingScreen:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            elif event.type in EXPOSE_EVENTS:
+                self.compositor.invalidate()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return False
         return True
     
-    def run(self):
+    def run(self, measure_startup: bool = False, layer_stats: bool = False):
         """Main game loop"""
-        running = True
+        # Get a frame on screen before the clock starts
+        self.present(self.compositor.render(self.time))
+        self.startup_marks.append(("first frame", time.perf_counter()))
+        if measure_startup:
+            print_startup(self.startup_marks)
+        self.clock.tick()
+        running = not measure_startup
         
         while running:
             dt = self.clock.tick(FPS) / 1000.0  # Delta time in seconds
@@ -300,20 +676,81 @@ class WaitingScreen:
             # Update animations
             self.update_animations(dt)
             
-            # Draw everything
-            self.draw_gradient_background()
-            self.draw_sun()
-            self.draw_ocean()
-            self.draw_island()
-            self.draw_grid_effect()
-            self.draw_text()
-            self.draw_loading_animation()
-            
-            pygame.display.flip()
+            # Only the areas of layers that changed are redrawn and presented
+            self.present(self.compositor.render(self.time))
         
+        if layer_stats:
+            print("\n".join(self.compositor.stats()))
         pygame.quit()
         sys.exit()
 
+def upscale_pixels(source: np.ndarray, target: np.ndarray, factor: int):
+    """
+    Nearest-neighbour upscale of (x, y) pixel values into target, factor times
+    the size. Each pixel is repeated across its row, then the row down its
+    block of rows, writing in memory order; several times faster than
+    pygame.transform.scale at 4K
+    """
+    width, height = source.shape
+    # Splitting the row axis of a view is always a view too, never a copy
+    blocks = target.T.reshape(height, factor, width * factor)
+    blocks[...] = np.repeat(source.T, factor, axis=1)[:, None]
+
+def default_window_size(resolution: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+    """Window for a render resolution: its largest whole multiple within SCREEN_WIDTH x SCREEN_HEIGHT"""
+    if resolution is None:
+        return SCREEN_WIDTH, SCREEN_HEIGHT
+    width, height = resolution
+    factor = max(1, min(SCREEN_WIDTH // width, SCREEN_HEIGHT // height))
+    return width * factor, height * factor
+
+def fit_viewport(size: Tuple[int, int], display_size: Tuple[int, int]) -> Tuple[pygame.Rect, int]:
+    """
+    Where a render of size is shown centered on the display, and its whole
+    upscale factor; 0 when it is larger than the display and shrunk to fit
+    """
+    width, height = size
+    display_width, display_height = display_size
+    factor = min(display_width // width, display_height // height)
+    if factor:
+        viewport = pygame.Rect(0, 0, width * factor, height * factor)
+    else:
+        ratio = min(display_width / width, display_height / height)
+        viewport = pygame.Rect(0, 0, int(width * ratio), int(height * ratio))
+    viewport.center = (display_width // 2, display_height // 2)
+    return viewport, factor
+
+def parse_resolution(value: str) -> Tuple[int, int]:
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{value}'")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError("resolution sides must be positive")
+    return width, height
+
+def print_startup(marks: List[Tuple[str, float]]):
+    """Print each cold start phase and the total time to the first frame"""
+    previous = IMPORT_START
+    for name, timestamp in marks:
+        print(f"   {name:<12}{(timestamp - previous) * 1000:8.1f} ms")
+        previous = timestamp
+    print(f"🌅 first frame {(previous - IMPORT_START) * 1000:.1f} ms after startup")
+
 if __name__ == "__main__":
-    waiting_screen = WaitingScreen()
-    waiting_screen.run()
+    parser = argparse.ArgumentParser(description="80's Style Waiting Screen")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="print the time to the first frame by phase, then quit")
+    parser.add_argument('--layer-stats', action='store_true',
+                        help="print each layer's average draw cost on exit")
+    parser.add_argument('--resolution', type=parse_resolution, default=None, metavar='WxH',
+                        help="render at this internal resolution (e.g. 320x240) and upscale it "
+                             "nearest-neighbour to the window")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="fill the screen at its native resolution")
+    parser.add_argument('--hue-shift', type=float, default=SKY_HUE_SHIFT, metavar='DEGREES',
+                        help="let the sky's hue drift this far either way over time")
+    args = parser.parse_args()
+    waiting_screen = WaitingScreen(hue_shift=args.hue_shift, resolution=args.resolution,
+                                   fullscreen=args.fullscreen)
+    waiting_screen.run(measure_startup=args.startup_time, layer_stats=args.layer_stats)
@@ -9,9 +9,10 @@ import subprocess
 import os
 
 def check_pygame():
-    """Check if pygame is available"""
+    """Check if pygame (and numpy, which the graphics version also needs) is available"""
     try:
         import pygame
+        import numpy
         return True
     except ImportError:
         return False
@@ -30,11 +31,11 @@ def install_pygame():
     """Try to install pygame"""
     print("🔧 Pygame not found. Attempting to install...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pygame"])
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pygame", "numpy"])
         return True
     except:
         try:
-            subprocess.check_call(["pip3", "install", "pygame"])
+            subprocess.check_call(["pip3", "install", "pygame", "numpy"])
             return True
         except:
             return False